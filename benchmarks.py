@@ -0,0 +1,813 @@
+#!/usr/bin/env python3
+"""
+Offline parity checks and micro-benchmarks for tv_transcript.py.
+
+Pages come from mock_forum_server.MockForum rendered in-process, so nothing here
+touches the network. Each subcommand first checks that a faster code path gives
+exactly the output of the original one, then times both:
+
+    python benchmarks.py parsers --pages 300
+"""
+import os
+import re
+import sys
+import csv
+import json
+import time
+import subprocess
+import logging
+import random
+import tempfile
+import tracemalloc
+import argparse
+from collections import Counter
+from typing import List, Dict, Tuple, Any, Optional, Callable
+
+import tv_transcript as tt
+from mock_forum_server import MockForum, MockForumConfig, start_server
+
+logger: logging.Logger = logging.getLogger("benchmarks")
+
+# Hand-written topic page with the awkward bits the mock forum doesn't produce
+EDGE_CASE_PAGE: str = (
+    "<!DOCTYPE html><html><head><title>Edge &amp; cases</title>"
+    "<script>var next = '<a href=\"x\">Next</a>';</script></head><body>"
+    '<a class="forumtitle notranslate" href="./viewforum.php?f=7&amp;sid=abc">Law &amp; Order</a>'
+    '<a class="topictitle" href="./viewtopic.php?t=9">01x02 - Café &quot;Noir&quot;</a>'
+    '<div class="post"><div class="postbody"><h3>01x02 - Café</h3>'
+    '<p class="author">by <strong><a class="username-coloured" href="#">bunniefuu</a></strong></p>'
+    '<div class="content">[00:00:01]&nbsp;BATMAN: Don\'t&hellip; <em>move</em>.<br/>\n'
+    "<!-- mod note --><script>track()</script>ALFRED:  Sir?<br>  <br>\n"
+    "<p>Unclosed paragraph<div>nested</div></div></div></div>"
+    '<div class="postbody"><p class="author">by <a class="username" href="#">viewer</a></p>'
+    '<div class="content">Thanks!</div></div>'
+    '<div class="pagination"><a class="button" href="./viewtopic.php?t=9&amp;start=10">2</a>'
+    '<a class="button" href="./viewtopic.php?t=9&amp;start=20">3</a>'
+    '<a href="./viewtopic.php?t=9&amp;start=10" rel="next">Next</a></div>'
+    "</body></html>"
+)
+
+# ------------------------------------------------------------------------------
+# Page corpus
+# ------------------------------------------------------------------------------
+def build_page_corpus(pages: int) -> Dict[str, List[Tuple[str, str]]]:
+    """Render (html, url) pairs for each page type from the mock forum."""
+    forum = MockForum(MockForumConfig(shows=max(pages, 50), episodes=max(pages, 40),
+                                      posts_per_topic=3, replies=2, posts_per_page=4))
+    base: str = tt.BASE_URL
+    shows_url: str = f"{base}/viewforum.php?f=1662"
+    corpus: Dict[str, List[Tuple[str, str]]] = {"show listing": [], "episode listing": [], "topic": []}
+    for i in range(pages):
+        show, page = divmod(i, 3)
+        corpus["show listing"].append((forum.tv_shows_page(page * 25), shows_url))
+        corpus["episode listing"].append((forum.show_forum_page(show, page * 25), f"{base}/viewforum.php?f={2000 + show}"))
+        corpus["topic"].append((forum.topic_page(show, page), f"{base}/viewtopic.php?t={forum.topic_id(show, page)}"))
+    corpus["topic"].append((EDGE_CASE_PAGE, f"{base}/viewtopic.php?t=9"))
+    return corpus
+
+
+PAGE_PARSERS: Dict[str, Callable[[str, str], "tt.ListingPage"]] = {
+    "show listing": tt._parse_show_listing,
+    "episode listing": tt._parse_episode_listing,
+    "topic": tt._parse_topic_page,
+}
+
+
+def available_backends() -> List[str]:
+    names: List[str] = []
+    for name in tt.PARSER_BACKENDS:
+        try:
+            tt.configure_parser(name)
+        except ImportError as exc:
+            logger.warning(f"Skipping parser '{name}': {exc}")
+            continue
+        names.append(name)
+    return names
+
+# ------------------------------------------------------------------------------
+# Parser Backends
+# ------------------------------------------------------------------------------
+def check_parser_parity(corpus: Dict[str, List[Tuple[str, str]]], backends: List[str]) -> bool:
+    """Every backend must extract the same titles, URLs, posts and pagination as BeautifulSoup."""
+    tt.configure_parser("bs4")
+    expected: Dict[str, List[Any]] = {
+        kind: [PAGE_PARSERS[kind](html, url) for html, url in pages] for kind, pages in corpus.items()
+    }
+    ok: bool = True
+    for name in backends:
+        tt.configure_parser(name)
+        for kind, pages in corpus.items():
+            for (html, url), reference in zip(pages, expected[kind]):
+                got = PAGE_PARSERS[kind](html, url)
+                if got != reference:
+                    ok = False
+                    logger.error(f"[{name}] {kind} mismatch for {url}:\n  bs4: {reference}\n  {name}: {got}")
+                    break
+        logger.info(f"Parity {name:>10}: {'ok' if ok else 'FAILED'}")
+    tt.configure_parser("bs4")
+    return ok
+
+
+def bench_parsers(corpus: Dict[str, List[Tuple[str, str]]], backends: List[str], repeat: int) -> None:
+    """Report pages/s and MB/s for each backend and page type."""
+    for kind, pages in corpus.items():
+        size: int = sum(len(html) for html, _ in pages)
+        baseline: Optional[float] = None
+        for name in backends:
+            tt.configure_parser(name)
+            parse = PAGE_PARSERS[kind]
+            best: float = float("inf")
+            for _ in range(repeat):
+                started: float = time.perf_counter()
+                for html, url in pages:
+                    parse(html, url)
+                best = min(best, time.perf_counter() - started)
+            baseline = baseline or best
+            logger.info(f"{kind:>15} {name:>10}: {len(pages) / best:8.1f} pages/s "
+                        f"{size / best / 1e6:6.1f} MB/s  x{baseline / best:.1f}")
+    tt.configure_parser("bs4")
+
+
+def run_parsers(args: argparse.Namespace) -> bool:
+    corpus = build_page_corpus(args.pages)
+    backends: List[str] = available_backends()
+    ok: bool = check_parser_parity(corpus, backends)
+    bench_parsers(corpus, backends, args.repeat)
+    return ok
+
+# ------------------------------------------------------------------------------
+# Targeted (SoupStrainer) Parsing
+# ------------------------------------------------------------------------------
+PAGE_KINDS: Dict[str, str] = {"show listing": "listing", "episode listing": "listing", "topic": "topic"}
+
+
+def measure_parse(backend: "tt.ParserBackend", page: str, pages: List[Tuple[str, str]]) -> Tuple[float, float]:
+    """Mean parse time (ms) and mean peak traced memory (KB) of building one page's tree."""
+    elapsed: float = float("inf")
+    for _ in range(3):
+        started: float = time.perf_counter()
+        for html, _ in pages:
+            backend.parse(html, page)
+        elapsed = min(elapsed, time.perf_counter() - started)
+
+    # Memory is traced in a separate pass; tracemalloc slows allocation down a lot
+    peak: int = 0
+    tracemalloc.start()
+    try:
+        for html, _ in pages:
+            tracemalloc.reset_peak()
+            baseline: int = tracemalloc.get_traced_memory()[0]
+            doc = backend.parse(html, page)
+            peak += tracemalloc.get_traced_memory()[1] - baseline
+            del doc
+    finally:
+        tracemalloc.stop()
+    return elapsed / len(pages) * 1000, peak / len(pages) / 1024
+
+
+def run_strainer(args: argparse.Namespace) -> bool:
+    corpus = build_page_corpus(args.pages)
+    ok: bool = check_parser_parity(corpus, ["bs4-targeted"])
+    full, targeted = tt.SoupBackend(), tt.SoupBackend(targeted=True)
+    for kind, pages in corpus.items():
+        full_ms, full_kb = measure_parse(full, PAGE_KINDS[kind], pages)
+        part_ms, part_kb = measure_parse(targeted, PAGE_KINDS[kind], pages)
+        logger.info(f"{kind:>15}: parse {full_ms:6.2f} -> {part_ms:6.2f} ms/page ({part_ms / full_ms - 1:+.0%}), "
+                    f"peak {full_kb:7.0f} -> {part_kb:7.0f} KB/page ({part_kb / full_kb - 1:+.0%})")
+    return ok
+
+# ------------------------------------------------------------------------------
+# Streaming Topic Extraction
+# ------------------------------------------------------------------------------
+def measure_topic_fetch(load: Callable[[str], "tt.ListingPage"], urls: List[str]) -> Tuple[float, float, List[Any]]:
+    """Mean latency (ms) and mean peak traced memory (KB) of fetching and parsing one topic page."""
+    pages: List[Any] = []
+    started: float = time.perf_counter()
+    for url in urls:
+        pages.append(load(url))
+    latency: float = (time.perf_counter() - started) / len(urls) * 1000
+
+    peak: int = 0
+    tracemalloc.start()
+    try:
+        for url in urls:
+            tracemalloc.reset_peak()
+            baseline: int = tracemalloc.get_traced_memory()[0]
+            page = load(url)
+            peak += tracemalloc.get_traced_memory()[1] - baseline
+            del page
+    finally:
+        tracemalloc.stop()
+    return latency, peak / len(urls) / 1024, pages
+
+
+def run_stream(args: argparse.Namespace) -> bool:
+    """Buffered fetch_page + BeautifulSoup against TopicStreamParser fed from the response stream."""
+    config = MockForumConfig(shows=1, episodes=args.pages, transcript_kb=args.transcript_kb,
+                             posts_per_topic=4, posts_per_page=10, slow_body_rate=1.0 if args.kbps else 0.0,
+                             slow_body_kbps=args.kbps or 1.0)
+    server, base_url = start_server(config)
+    try:
+        tt.set_base_url(base_url)
+        tt.configure_parser("bs4")
+        forum = MockForum(config)
+        urls: List[str] = [f"{base_url}/viewtopic.php?t={forum.topic_id(0, episode)}" for episode in range(args.pages)]
+        buffered_ms, buffered_kb, expected = measure_topic_fetch(lambda url: tt._parse_topic_page(tt.fetch_page(url), url), urls)
+        stream_ms, stream_kb, got = measure_topic_fetch(tt.stream_topic_page, urls)
+    finally:
+        server.shutdown()
+    ok: bool = got == expected
+    logger.info(f"Parity stream: {'ok' if ok else 'FAILED'}")
+    logger.info(f"{len(urls)} topic pages of ~{args.transcript_kb:.0f} KB"
+                + (f" trickled at {args.kbps:.0f} KB/s" if args.kbps else ""))
+    logger.info(f"  buffered: {buffered_ms:7.1f} ms/page, peak {buffered_kb:7.0f} KB/page")
+    logger.info(f"  streamed: {stream_ms:7.1f} ms/page ({stream_ms / buffered_ms - 1:+.0%}), "
+                f"peak {stream_kb:7.0f} KB/page ({stream_kb / buffered_kb - 1:+.0%})")
+    return ok
+
+# ------------------------------------------------------------------------------
+# Charset Handling
+# ------------------------------------------------------------------------------
+def measure_cpu(work: Callable[[Any], Any], items: List[Any], repeat: int) -> Tuple[float, List[Any]]:
+    """Best-of-`repeat` CPU time (ms) per item, and the results of the last run."""
+    best: float = float("inf")
+    results: List[Any] = []
+    for _ in range(repeat):
+        started: float = time.process_time()
+        results = [work(item) for item in items]
+        best = min(best, time.process_time() - started)
+    return best / len(items) * 1000, results
+
+
+def run_charset(args: argparse.Namespace) -> bool:
+    """
+    Response.text (requests' charset handling) against page_from_response's raw
+    bytes + declared charset, each followed by the topic page parse. Responses are
+    fetched once up front, so only decoding and parsing are timed.
+    """
+    ok: bool = True
+    content_types: Dict[str, str] = {"header charset": "text/html; charset=UTF-8",
+                                     "meta charset only": "text/html", "no Content-Type": ""}
+    for label, content_type in content_types.items():
+        config = MockForumConfig(shows=1, episodes=args.pages, transcript_kb=args.transcript_kb, content_type=content_type)
+        server, base_url = start_server(config)
+        try:
+            forum = MockForum(config)
+            urls: List[str] = [f"{base_url}/viewtopic.php?t={forum.topic_id(0, episode)}" for episode in range(args.pages)]
+            responses: List[Any] = [tt._http_get_with_retries(url) for url in urls]
+        finally:
+            server.shutdown()
+        tt.set_base_url(base_url)
+        decode_before, texts = measure_cpu(lambda response: response.text, responses, args.repeat)
+        decode_after, pages = measure_cpu(lambda response: tt.page_from_response(response.url, response),
+                                          responses, args.repeat)
+        logger.info(f"{label:>17} {'decode only':>12}: {decode_before:6.2f} -> {decode_after:6.2f} ms CPU/page")
+        for name in available_backends():
+            tt.configure_parser(name)
+            before_ms, expected = measure_cpu(lambda text: tt._parse_topic_page(text, base_url), texts, args.repeat)
+            after_ms, got = measure_cpu(lambda page: tt._parse_topic_page(page, base_url), pages, args.repeat)
+            before_ms += decode_before
+            after_ms += decode_after
+            if got != expected:
+                ok = False
+                logger.error(f"[{label}/{name}] output differs from Response.text")
+            logger.info(f"{label:>17} {name:>12}: {before_ms:6.2f} -> {after_ms:6.2f} ms CPU/page "
+                        f"({after_ms - before_ms:+.2f} ms, {after_ms / before_ms - 1:+.0%})")
+    tt.configure_parser("bs4")
+    return ok
+
+# ------------------------------------------------------------------------------
+# Analyzer State
+# ------------------------------------------------------------------------------
+def run_analyzer(args: argparse.Namespace) -> bool:
+    """
+    Per-episode analysis with one shared Analyzer against a fresh one per episode,
+    which pays the per-call setup the module functions used to (stopword set,
+    lemmatizer, regex compilation, cold lemma cache).
+    """
+    ok: bool = True
+    tt.get_analyzer().warm_up()
+    for transcript_kb in args.transcript_kb:
+        forum = MockForum(MockForumConfig(shows=1, episodes=args.episodes, transcript_kb=transcript_kb))
+        items: List[Tuple[Dict[str, Any], str]] = [
+            ({"season": "01", "episode": f"{episode + 1:02d}", "title": f"Episode {episode + 1}"},
+             "\n".join(html for _, html in forum.topic_posts(0, episode)))
+            for episode in range(args.episodes)
+        ]
+        before_ms, expected = measure_cpu(lambda item: tt.Analyzer().analyze(*item), items, args.repeat)
+        shared = tt.Analyzer()
+        after_ms, got = measure_cpu(lambda item: shared.analyze(*item), items, args.repeat)
+        if got != expected:
+            ok = False
+            logger.error(f"[{transcript_kb:g} KB] shared Analyzer output differs")
+        cache = shared.lemmatize.cache_info()
+        logger.info(f"{transcript_kb:6g} KB transcripts: {before_ms:7.2f} -> {after_ms:7.2f} ms CPU/episode "
+                    f"({after_ms - before_ms:+.2f} ms, {after_ms / before_ms - 1:+.0%}), "
+                    f"lemma cache {cache.hits / max(1, cache.hits + cache.misses):.0%} hits, {cache.currsize} entries")
+    return ok
+
+# ------------------------------------------------------------------------------
+# Story Element Matching
+# ------------------------------------------------------------------------------
+BATMAN_CSV: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cleaneddata_batman.csv")
+
+
+def load_batman_transcripts() -> List[str]:
+    """The 'Cleaned Transcript' column of data/cleaneddata_batman.csv."""
+    csv.field_size_limit(1 << 30)
+    with open(BATMAN_CSV, "r", encoding="utf-8", newline="") as f:
+        return [row["Cleaned Transcript"] for row in csv.DictReader(f) if row["Cleaned Transcript"]]
+
+
+def grow_lexicon(lexicon: Dict[Any, str], size: int, vocabulary: List[str], rng: random.Random) -> Dict[Any, str]:
+    """`lexicon` plus synthetic entries up to `size`: 1-3 word phrases in which a fifth of the words are real ones."""
+    grown: Dict[Any, str] = dict(lexicon)
+    while len(grown) < size:
+        words: List[str] = [rng.choice(vocabulary) if rng.random() < 0.2 else
+                            "".join(rng.choice("aeioubcdfghlmnprstv") for _ in range(rng.randint(4, 9)))
+                            for _ in range(rng.randint(1, 3))]
+        grown[f"synthetic {len(grown)}"] = rf"\b({' '.join(words)}|{words[0]}s)\b"
+    return grown
+
+
+def run_lexicon(args: argparse.Namespace) -> bool:
+    """One re.finditer pass per lexicon pattern (the old annotate_story_elements) against LexiconMatcher.find."""
+    forum = MockForum(MockForumConfig(shows=1, episodes=args.episodes, transcript_kb=args.transcript_kb))
+    texts: List[str] = ["\n".join(html for _, html in forum.topic_posts(0, episode)).lower() for episode in range(args.episodes)]
+    texts += load_batman_transcripts()
+    vocabulary: List[str] = sorted({word for text in texts for word in re.findall(r"[a-z]{3,}", text)})
+    base: Dict[Any, str] = {**{("negative", element): pattern for element, pattern in tt.NEGATIVE_ELEMENTS.items()},
+                            **{("positive", element): pattern for element, pattern in tt.POSITIVE_ELEMENTS.items()}}
+    rng = random.Random(0)
+    ok: bool = True
+    logger.info(f"{len(texts)} transcripts ({args.episodes} mock, {len(texts) - args.episodes} Batman), "
+                f"{sum(map(len, texts)) / len(texts) / 1024:.0f} KB on average")
+    for size in sorted({len(base), *args.sizes}):
+        lexicon: Dict[Any, str] = grow_lexicon(base, size, vocabulary, rng)
+        compiled: Dict[Any, re.Pattern] = {label: re.compile(pattern, re.IGNORECASE) for label, pattern in lexicon.items()}
+        per_pattern_ms, expected = measure_cpu(
+            lambda text: {label: [m.span() for m in regex.finditer(text)] for label, regex in compiled.items()},
+            texts, args.repeat)
+        matcher = tt.LexiconMatcher(lexicon)
+        matcher_ms, got = measure_cpu(matcher.find, texts, args.repeat)
+        if got != expected:
+            ok = False
+            logger.error(f"[{size} patterns] LexiconMatcher spans differ from per-pattern regexes")
+        hits: float = sum(len(spans) for result in got for spans in result.values()) / len(texts)
+        logger.info(f"  {len(lexicon):5d} patterns: {per_pattern_ms:8.2f} -> {matcher_ms:6.2f} ms CPU/episode "
+                    f"(x{per_pattern_ms / matcher_ms:.1f}), {hits:.0f} hits/episode")
+    return ok
+
+# ------------------------------------------------------------------------------
+# Episode Documents
+# ------------------------------------------------------------------------------
+def analyze_stage_by_stage(analyzer: "tt.Analyzer", episode: Dict[str, Any], transcript_raw: str) -> Dict[str, Any]:
+    """analyze_transcript as it was before EpisodeDocument: each stage lowercases and tokenizes for itself."""
+    transcript_clean: str = analyzer.clean(transcript_raw)
+    negative, positive = analyzer.annotate_story_elements(transcript_raw.lower())
+    return {"season": episode["season"], "episode": episode["episode"], "title": episode["title"],
+            "cleaned_transcript": analyzer.tokenize_and_lemmatize(transcript_clean),
+            "negative_story_elements": negative, "positive_story_elements": positive,
+            "narrative_tone": analyzer.analyze_narrative_tone(transcript_clean)}
+
+
+def run_document(args: argparse.Namespace) -> bool:
+    """CPU per episode on the Batman corpus: stage-by-stage analysis against one shared EpisodeDocument."""
+    analyzer = tt.get_analyzer()
+    analyzer.warm_up()
+    items: List[Tuple[Dict[str, Any], str]] = [
+        ({"season": "01", "episode": f"{i + 1:02d}", "title": f"Episode {i + 1}"}, text)
+        for i, text in enumerate(load_batman_transcripts())
+    ]
+    before_ms, expected = measure_cpu(lambda item: analyze_stage_by_stage(analyzer, *item), items, args.repeat)
+    after_ms, got = measure_cpu(lambda item: analyzer.analyze(*item), items, args.repeat)
+    ok: bool = got == expected
+    logger.info(f"Parity document: {'ok' if ok else 'FAILED'}")
+    logger.info(f"{len(items)} Batman transcripts: {before_ms:.2f} -> {after_ms:.2f} ms CPU/episode "
+                f"({after_ms - before_ms:+.2f} ms, {after_ms / before_ms - 1:+.0%})")
+    return ok
+
+# ------------------------------------------------------------------------------
+# Tokenizer
+# ------------------------------------------------------------------------------
+def alphanumeric_tokens(text: str) -> List[str]:
+    """What the analysis keeps of word_tokenize's output: the reference for fast_word_tokenize."""
+    return [token for token in tt.word_tokenize(text) if token.isalnum()]
+
+
+# Pieces of the punctuation-dense fragments fast_word_tokenize is stress-tested on
+STRESS_WORDS: List[str] = "the batman don't can't it's robin 42 3.5 mr. a i gonna o'clock well-known x_y".split()
+STRESS_PUNCTUATION: List[str] = list(".,;:!?'\"()[]-—…/&$%*@#") + ["--", "...", "''", "``"]
+
+
+def run_tokenizer(args: argparse.Namespace) -> bool:
+    """
+    fast_word_tokenize against word_tokenize + isalnum. Gating: exact parity on the Batman
+    corpus (little punctuation) and on mock transcripts, cleaned and as raw posts (speaker
+    tags, timestamps, punctuated dialogue). Reported only: agreement on random fragments
+    packed with punctuation, where Punkt's abbreviation handling and contractions inside
+    unsplit chunks make the two differ. Also tokens/s.
+    """
+    texts: List[str] = load_batman_transcripts()
+    tt.word_tokenize("warm up")
+    tokens: int = sum(len(alphanumeric_tokens(text)) for text in texts)
+    nltk_ms, expected = measure_cpu(alphanumeric_tokens, texts, args.repeat)
+    fast_ms, got = measure_cpu(tt.fast_word_tokenize, texts, args.repeat)
+    ok: bool = got == expected
+    logger.info(f"Parity tokenizer (Batman): {'ok' if ok else 'FAILED'}")
+    for label, ms in (("nltk", nltk_ms), ("fast", fast_ms)):
+        logger.info(f"  {label}: {tokens / (ms * len(texts) / 1000) / 1000:7.0f}k tokens/s CPU")
+    logger.info(f"{len(texts)} Batman transcripts, {tokens} tokens: {nltk_ms:.2f} -> {fast_ms:.2f} ms CPU/episode "
+                f"({fast_ms / nltk_ms - 1:+.0%})")
+
+    forum = MockForum(MockForumConfig(shows=1, episodes=args.episodes, transcript_kb=args.transcript_kb))
+    raw: List[str] = ["\n".join(html for _, html in forum.topic_posts(0, episode)) for episode in range(args.episodes)]
+    for label, mock in (("cleaned", [tt.clean_transcript(text) for text in raw]), ("raw", raw)):
+        same: int = sum(alphanumeric_tokens(text) == tt.fast_word_tokenize(text) for text in mock)
+        ok = ok and same == len(mock)
+        logger.info(f"Parity tokenizer (mock transcripts, {label}): {'ok' if same == len(mock) else 'FAILED'} "
+                    f"({same}/{len(mock)} identical)")
+
+    rng = random.Random(0)
+    fragments: List[str] = [
+        "".join(rng.choice(STRESS_WORDS + STRESS_PUNCTUATION) + rng.choice(["", " ", " "]) for _ in range(8))
+        for _ in range(args.fragments)
+    ]
+    same = sum(alphanumeric_tokens(text) == tt.fast_word_tokenize(text) for text in fragments)
+    logger.info(f"Punctuation-dense fragments tokenized identically: {same}/{len(fragments)} "
+                f"({same / len(fragments):.1%}, not gating)")
+    return ok
+
+# ------------------------------------------------------------------------------
+# Batch Lemmatization
+# ------------------------------------------------------------------------------
+def run_lemmas(args: argparse.Namespace) -> bool:
+    """
+    Lemmatizing the Batman corpus one WordNet call per token occurrence (the original
+    tokenize_and_lemmatize) against Analyzer.lemmatize_batch over batches of episodes,
+    which lemmatizes each distinct type once. The batches run without the lemma cache,
+    so each pays for its own vocabulary; the cached per-token path is shown for reference.
+    """
+    analyzer = tt.get_analyzer()
+    analyzer.warm_up()
+    uncached = tt.Analyzer(lemma_cache_size=0)
+    token_lists: List[List[str]] = [analyzer.tokenize(text) for text in load_batman_transcripts()]
+    stop_words = analyzer.stop_words
+    lemmatize = analyzer.lemmatizer.lemmatize
+    per_token_ms, expected = measure_cpu(
+        lambda tokens: [lemmatize(token) for token in tokens if token.isalnum() and token not in stop_words],
+        token_lists, args.repeat)
+    occurrences: int = sum(map(len, expected))
+    logger.info(f"{len(token_lists)} Batman transcripts, {occurrences} lemmatized tokens: "
+                f"{per_token_ms:.2f} ms CPU/episode one call per token")
+    analyzer.lemmatize.cache_clear()
+    cached_ms, got = measure_cpu(analyzer.lemmatize_tokens, token_lists, 1)
+    ok: bool = got == expected
+    logger.info(f"  LRU lemma cache:   {cached_ms:.2f} ms CPU/episode ({cached_ms / per_token_ms - 1:+.0%})")
+    for batch_size in args.batch_sizes:
+        batches: List[List[List[str]]] = [token_lists[i:i + batch_size] for i in range(0, len(token_lists), batch_size)]
+        types: int = sum(len({token for tokens in batch for token in tokens
+                              if token.isalnum() and token not in stop_words}) for batch in batches)
+        best: float = float("inf")
+        got: List[List[str]] = []
+        for _ in range(args.repeat):
+            started: float = time.process_time()
+            got = [lemmas for batch in batches for lemmas in uncached.lemmatize_batch(batch)]
+            best = min(best, time.process_time() - started)
+        if got != expected:
+            ok = False
+            logger.error(f"[batch {batch_size}] lemmatize_batch output differs")
+        batched_ms: float = best / len(token_lists) * 1000
+        logger.info(f"  batches of {batch_size:3d}: type/token {types / occurrences:.3f}, {types} WordNet calls, "
+                    f"{batched_ms:.2f} ms CPU/episode ({batched_ms - per_token_ms:+.2f} ms, {batched_ms / per_token_ms - 1:+.0%})")
+    return ok
+
+# A pool worker's cold start in a fresh interpreter, the way _init_analysis_worker does it;
+# the probe prints its peak RSS (Linux) and whether WordNet got loaded
+LEMMATIZER_STARTUP: Dict[str, str] = {
+    "WordNet": "import tv_transcript as tt; tt.Analyzer().warm_up()",
+    "lemma table": "import tv_transcript as tt; tt.configure_lemma_table({path!r}); tt.Analyzer().warm_up()",
+}
+WORDNET_LOADED: str = "type(sys.modules['nltk.corpus'].wordnet).__name__ != 'LazyCorpusLoader'"
+
+
+def run_lemma_table(args: argparse.Namespace) -> bool:
+    """
+    Build a lemma table from raw mock transcripts (as --build-lemma-table would from a crawl)
+    plus WordNet's exception forms, check every entry against WordNetLemmatizer, and compare
+    per-word lookups and a worker's cold start (Analyzer().warm_up() in a fresh interpreter:
+    time, peak RSS, whether WordNet loaded) with and without the table.
+    """
+    directory: str = tempfile.mkdtemp()
+    path: str = args.output or os.path.join(directory, "lemmas.tbl")
+    forum = MockForum(MockForumConfig(shows=1, episodes=args.episodes, transcript_kb=args.transcript_kb))
+    raw: List[str] = ["\n".join(html for _, html in forum.topic_posts(0, episode)) for episode in range(args.episodes)]
+    source: str = os.path.join(directory, "transcripts.txt")
+    with open(source, "w", encoding="utf-8") as f:
+        f.write("\n".join(raw))
+    started: float = time.perf_counter()
+    count: int = tt.build_lemma_table_from_files(path, [source])
+    logger.info(f"Built {path}: {count} words, {os.path.getsize(path) / 1024:.0f} KB in {time.perf_counter() - started:.1f}s")
+
+    table = tt.LemmaTable(path)
+    analyzer = tt.get_analyzer()
+    lemmatize = analyzer.lemmatizer.lemmatize
+    words: List[str] = sorted(tt.wordnet_exception_forms() | {
+        token for text in raw for token in analyzer.tokenize(analyzer.clean(text))
+        if token.isalnum() and token not in analyzer.stop_words
+    })
+    missing: List[str] = [word for word in words if table.get(word) is None]
+    wrong: List[str] = [word for word in words if table.get(word) not in (None, lemmatize(word))]
+    ok: bool = not missing and not wrong
+    logger.info(f"Parity lemma table: {'ok' if ok else 'FAILED'} ({len(missing)} missing, {len(wrong)} differ of {len(words)})")
+    table_ms, _ = measure_cpu(table.get, words, args.repeat)
+    wordnet_ms, _ = measure_cpu(lemmatize, words, args.repeat)
+    logger.info(f"  lookup:  WordNet {wordnet_ms * 1000:.2f} us/word, table {table_ms * 1000:.2f} us/word")
+    table.close()
+
+    package: str = os.path.dirname(os.path.abspath(__file__))
+    for label, code in LEMMATIZER_STARTUP.items():
+        # VmHWM rather than ru_maxrss, which a child inherits from this (WordNet-loaded) process
+        probe: str = f"import sys; sys.path.insert(0, {package!r}); {code.format(path=path)}; " \
+                     f"print([line.split()[1] for line in open('/proc/self/status') if line.startswith('VmHWM')][0], " \
+                     f"{WORDNET_LOADED})"
+        rss_kb, wordnet_loaded = subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True,
+                                                text=True).stdout.split()
+        startup_ms: float = measure_command([sys.executable, "-c", probe], args.repeat)
+        logger.info(f"  cold start, {label:11s}: {startup_ms:7.1f} ms, peak RSS {int(rss_kb) / 1024:6.1f} MB, "
+                    f"WordNet {'loaded' if wordnet_loaded == 'True' else 'not loaded'}")
+        if label == "lemma table" and wordnet_loaded == "True":
+            ok = False
+            logger.error("Warming up an Analyzer with a lemma table loaded WordNet")
+    return ok
+
+# ------------------------------------------------------------------------------
+# Token Corpus
+# ------------------------------------------------------------------------------
+def retained_bytes(build: Callable[[], Any]) -> Tuple[int, Any]:
+    """Bytes still allocated (per tracemalloc) once build() returns, and what it built."""
+    tracemalloc.start()
+    try:
+        built = build()
+        return tracemalloc.get_traced_memory()[0], built
+    finally:
+        tracemalloc.stop()
+
+
+def run_corpus(args: argparse.Namespace) -> bool:
+    """
+    The Batman corpus as split strings against a TokenCorpus: memory held, per-episode
+    term counts (Counter over split() vs one bincount), tone keyword counts, and a
+    save/load round trip through .npz.
+    """
+    import numpy as np
+    records: List[Dict[str, Any]] = [
+        {"season": "01", "episode": f"{i + 1:02d}", "title": f"Episode {i + 1}", "cleaned_transcript": text}
+        for i, text in enumerate(load_batman_transcripts())
+    ]
+    split_bytes, split = retained_bytes(lambda: [record["cleaned_transcript"].split() for record in records])
+    corpus_bytes, corpus = retained_bytes(lambda: tt.TokenCorpus.from_records(records))
+    logger.info(f"{len(records)} Batman transcripts, {len(corpus.ids)} tokens, {len(corpus.vocabulary)} types: "
+                f"lists of str {split_bytes / 1e6:.2f} MB -> TokenCorpus {corpus_bytes / 1e6:.2f} MB "
+                f"({split_bytes / corpus_bytes:.1f}x smaller; ID and offset arrays {(corpus.ids.nbytes + corpus.offsets.nbytes) / 1e6:.2f} MB, "
+                f"the rest is the vocabulary)")
+
+    ok: bool = [corpus.tokens(i) for i in range(len(corpus))] == split
+    best: Dict[str, float] = {"split": float("inf"), "corpus": float("inf")}
+    for _ in range(args.repeat):
+        started: float = time.process_time()
+        expected: List[Counter] = [Counter(record["cleaned_transcript"].split()) for record in records]
+        best["split"] = min(best["split"], time.process_time() - started)
+        started = time.process_time()
+        matrix = corpus.term_counts()
+        best["corpus"] = min(best["corpus"], time.process_time() - started)
+    got: List[Dict[str, int]] = [{corpus.vocabulary[i]: int(row[i]) for i in np.flatnonzero(row)} for row in matrix]
+    ok = ok and got == [dict(counts) for counts in expected]
+    logger.info(f"  term counts: Counter(split()) {best['split'] * 1000:.1f} ms -> term_counts() {best['corpus'] * 1000:.1f} ms")
+
+    keywords: List[str] = [keyword for keywords in tt.TONE_KEYWORDS.values() for keyword in keywords]
+    keyword_ms, _ = measure_cpu(lambda _: [[counter[keyword] for keyword in keywords]
+                                           for counter in (Counter(record["cleaned_transcript"].split()) for record in records)],
+                                [None], args.repeat)
+    vector_ms, counts = measure_cpu(lambda _: corpus.count_terms(keywords), [None], args.repeat)
+    ok = ok and counts[0].tolist() == [[counter[keyword] for keyword in keywords] for counter in expected]
+    logger.info(f"  {len(keywords)} tone keywords: {keyword_ms:.1f} ms -> count_terms() {vector_ms:.1f} ms")
+
+    path: str = os.path.join(tempfile.mkdtemp(), "corpus.npz")
+    corpus.save(path)
+    started = time.perf_counter()
+    loaded = tt.TokenCorpus.load(path)
+    load_ms: float = (time.perf_counter() - started) * 1000
+    ok = ok and loaded.vocabulary == corpus.vocabulary and loaded.episodes == corpus.episodes \
+        and np.array_equal(loaded.ids, corpus.ids) and np.array_equal(loaded.offsets, corpus.offsets)
+    logger.info(f"  .npz: {os.path.getsize(path) / 1e6:.2f} MB, loads in {load_ms:.1f} ms")
+    logger.info(f"Parity corpus: {'ok' if ok else 'FAILED'}")
+    return ok
+
+# ------------------------------------------------------------------------------
+# Timestamp Context
+# ------------------------------------------------------------------------------
+def run_timestamps(args: argparse.Namespace) -> bool:
+    """
+    Nearby timestamps per match: TIMESTAMP_REGEX.findall over a sliced window (the old
+    annotate_story_elements) against TimestampIndex.window. Every word counts as a match,
+    the densest case, so overlapping windows are re-scanned as often as possible.
+    """
+    forum = MockForum(MockForumConfig(shows=1, episodes=args.episodes, transcript_kb=args.transcript_kb))
+    texts: List[str] = ["\n".join(html for _, html in forum.topic_posts(0, episode)).lower() for episode in range(args.episodes)]
+    spans: List[List[Tuple[int, int]]] = [[match.span() for match in re.finditer(r"\b\w+\b", text)] for text in texts]
+    matches: int = sum(map(len, spans))
+    ok: bool = True
+    logger.info(f"{len(texts)} transcripts of ~{args.transcript_kb:.0f} KB, {matches // len(texts)} matches each")
+    for window in args.windows:
+        started: float = time.process_time()
+        expected: List[List[str]] = [tt.TIMESTAMP_REGEX.findall(text[max(0, start - window):end + window])
+                                     for text, text_spans in zip(texts, spans) for start, end in text_spans]
+        sliced_s: float = time.process_time() - started
+        started = time.process_time()
+        got: List[List[str]] = []
+        for text, text_spans in zip(texts, spans):
+            index = tt.TimestampIndex(text)
+            got.extend(index.window(start - window, end + window) for start, end in text_spans)
+        indexed_s: float = time.process_time() - started
+        if got != expected:
+            ok = False
+            logger.error(f"[window {window}] TimestampIndex differs from findall on the slice")
+        logger.info(f"  ±{window:5d} chars: {sliced_s / matches * 1e6:7.2f} -> {indexed_s / matches * 1e6:5.2f} us CPU/match "
+                    f"(x{sliced_s / indexed_s:.1f}, index build included)")
+    return ok
+
+# ------------------------------------------------------------------------------
+# Analysis Worker Pool
+# ------------------------------------------------------------------------------
+def run_analysis(args: argparse.Namespace) -> bool:
+    """In-process analyze_transcript against AnalysisPool at increasing worker counts."""
+    forum = MockForum(MockForumConfig(shows=1, episodes=args.episodes, transcript_kb=args.transcript_kb))
+    items: List[Tuple[Dict[str, Any], str]] = []
+    for episode in range(args.episodes):
+        meta: Dict[str, Any] = {"season": "01", "episode": f"{episode + 1:02d}", "title": f"Episode {episode + 1}"}
+        items.append((meta, "\n".join(html for _, html in forum.topic_posts(0, episode))))
+    tt.analyze_transcript(*items[0])   # load NLTK resources outside the timed run
+
+    started: float = time.perf_counter()
+    expected: List[Dict[str, Any]] = [tt.analyze_transcript(meta, text) for meta, text in items]
+    serial_s: float = time.perf_counter() - started
+    logger.info(f"{args.episodes} transcripts of ~{args.transcript_kb:.0f} KB, {os.cpu_count()} CPUs")
+    logger.info(f"  in-process: {args.episodes / serial_s:7.1f} episodes/s")
+
+    ok: bool = True
+    counts: List[int] = args.workers or sorted({1, 2, 4, 8, 16, os.cpu_count() or 1})
+    for workers in counts:
+        started = time.perf_counter()
+        with tt.AnalysisPool(workers, args.chunk_size) as pool:
+            startup_s: float = time.perf_counter() - started
+            started = time.perf_counter()
+            for meta, text in items:
+                pool.submit(meta, text)
+            got: List[Dict[str, Any]] = pool.results()
+            elapsed: float = time.perf_counter() - started
+        if got != expected:
+            ok = False
+            logger.error(f"[{workers} workers] output differs from in-process analysis")
+        speedup: float = serial_s / elapsed
+        logger.info(f"  {workers:3d} workers: {args.episodes / elapsed:7.1f} episodes/s, {speedup:5.2f}x "
+                    f"({speedup / workers:.0%} per worker), startup {startup_s * 1000:.0f} ms")
+    return ok
+
+# ------------------------------------------------------------------------------
+# Import Time
+# ------------------------------------------------------------------------------
+# Modules that only exist in sys.modules once the heavy dependencies have really been
+# imported (requests and asyncio themselves are importlib lazy-module placeholders)
+HEAVY_MODULES: Tuple[str, ...] = ("requests.adapters", "urllib3", "bs4", "soupsieve", "nltk", "asyncio.events")
+
+
+def measure_command(command: List[str], repeat: int) -> float:
+    """Best-of-`repeat` wall time (ms) of running `command` in a fresh interpreter."""
+    best: float = float("inf")
+    for _ in range(repeat):
+        started: float = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run_imports(args: argparse.Namespace) -> bool:
+    """Cold-start cost of `import tv_transcript` and `--help`, and which heavy modules the import pulls in."""
+    script: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tv_transcript.py")
+    probe: str = f"import json, sys, tv_transcript; print(json.dumps([m for m in {list(HEAVY_MODULES)!r} if m in sys.modules]))"
+    loaded: List[str] = json.loads(subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True,
+                                                  text=True, cwd=os.path.dirname(script)).stdout)
+    ok: bool = not loaded
+    if loaded:
+        logger.error(f"import tv_transcript loaded {', '.join(loaded)}")
+    logger.info(f"Heavy modules after import: {', '.join(loaded) or 'none'}")
+
+    baseline_ms: float = measure_command([sys.executable, "-c", "pass"], args.repeat)
+    import_ms: float = measure_command([sys.executable, "-c", "import tv_transcript"], args.repeat)
+    help_ms: float = measure_command([sys.executable, script, "--help"], args.repeat)
+    logger.info(f"  interpreter start:     {baseline_ms:7.1f} ms")
+    logger.info(f"  import tv_transcript:  {import_ms:7.1f} ms (+{import_ms - baseline_ms:.1f} ms)")
+    logger.info(f"  tv_transcript --help:  {help_ms:7.1f} ms (+{help_ms - baseline_ms:.1f} ms)")
+
+    report: str = subprocess.run([sys.executable, "-X", "importtime", "-c", "import tv_transcript"], check=True,
+                                 capture_output=True, text=True, cwd=os.path.dirname(script)).stderr
+    rows: List[Tuple[int, str]] = []
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:"):].split("|")
+        if name.strip() == "site":   # interpreter startup, not tv_transcript
+            rows = []
+            continue
+        rows.append((int(self_us), name.strip()))
+    logger.info("  slowest modules (self time):")
+    for self_us, name in sorted(rows, reverse=True)[:args.top]:
+        logger.info(f"    {self_us / 1000:6.1f} ms  {name}")
+    return ok
+
+# ------------------------------------------------------------------------------
+# Main Entry Point
+# ------------------------------------------------------------------------------
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Parity checks and benchmarks for tv_transcript.py.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    parsers = commands.add_parser("parsers", help="HTML parser backends: parity and pages/s")
+    parsers.add_argument("--pages", type=int, default=150, help="pages of each type to parse")
+    parsers.add_argument("--repeat", type=int, default=3, help="timing runs (best is reported)")
+    parsers.set_defaults(run=run_parsers)
+    strainer = commands.add_parser("strainer", help="targeted BeautifulSoup parsing: parse time and memory per page type")
+    strainer.add_argument("--pages", type=int, default=60, help="pages of each type to parse")
+    strainer.set_defaults(run=run_strainer)
+    stream = commands.add_parser("stream", help="streamed topic extraction: latency and memory against a local mock forum")
+    stream.add_argument("--pages", type=int, default=20, help="topic pages to fetch")
+    stream.add_argument("--transcript-kb", type=float, default=400, help="approximate transcript size per topic")
+    stream.add_argument("--kbps", type=float, default=4000, help="body trickle rate (0 = as fast as possible)")
+    stream.set_defaults(run=run_stream)
+    charset = commands.add_parser("charset", help="raw bytes + declared charset vs Response.text: CPU per page")
+    charset.add_argument("--pages", type=int, default=30, help="topic pages to fetch per case")
+    charset.add_argument("--transcript-kb", type=float, default=100, help="approximate transcript size per topic")
+    charset.add_argument("--repeat", type=int, default=5, help="timing runs (best is reported)")
+    charset.set_defaults(run=run_charset)
+    analyzer = commands.add_parser("analyzer", help="shared Analyzer state vs per-episode setup: CPU per episode")
+    analyzer.add_argument("--episodes", type=int, default=20, help="transcripts per size")
+    analyzer.add_argument("--transcript-kb", type=float, nargs="+", default=[0.5, 5, 40], help="transcript sizes to try")
+    analyzer.add_argument("--repeat", type=int, default=3, help="timing runs (best is reported)")
+    analyzer.set_defaults(run=run_analyzer)
+    lexicon = commands.add_parser("lexicon", help="single-pass story element matching vs a regex pass per pattern")
+    lexicon.add_argument("--episodes", type=int, default=10, help="mock transcripts (the Batman corpus is always added)")
+    lexicon.add_argument("--transcript-kb", type=float, default=40, help="approximate mock transcript size")
+    lexicon.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000], help="lexicon sizes to try")
+    lexicon.add_argument("--repeat", type=int, default=3, help="timing runs (best is reported)")
+    lexicon.set_defaults(run=run_lexicon)
+    document = commands.add_parser("document", help="tokenize-once EpisodeDocument vs stage-by-stage analysis on the Batman corpus")
+    document.add_argument("--repeat", type=int, default=5, help="timing runs (best is reported)")
+    document.set_defaults(run=run_document)
+    tokenizer = commands.add_parser("tokenizer", help="Punkt-free fast tokenizer: parity with word_tokenize and tokens/s")
+    tokenizer.add_argument("--episodes", type=int, default=10, help="mock transcripts checked for agreement")
+    tokenizer.add_argument("--transcript-kb", type=float, default=40, help="approximate mock transcript size")
+    tokenizer.add_argument("--fragments", type=int, default=2000, help="random punctuation-dense fragments to compare")
+    tokenizer.add_argument("--repeat", type=int, default=3, help="timing runs (best is reported)")
+    tokenizer.set_defaults(run=run_tokenizer)
+    lemmas = commands.add_parser("lemmas", help="batch lemmatization over a shared vocabulary vs a WordNet call per token")
+    lemmas.add_argument("--batch-sizes", type=int, nargs="+", default=[1, tt.ANALYSIS_CHUNK_SIZE, 16, 64],
+                        help="episodes per batch to try")
+    lemmas.add_argument("--repeat", type=int, default=3, help="timing runs (best is reported)")
+    lemmas.set_defaults(run=run_lemmas)
+    lemma_table = commands.add_parser("lemma-table", help="precompiled lemma table: parity with WordNet, cold start and lookups")
+    lemma_table.add_argument("--output", help="where to write the table (default: a temporary directory)")
+    lemma_table.add_argument("--episodes", type=int, default=10, help="raw mock transcripts to build the table from")
+    lemma_table.add_argument("--transcript-kb", type=float, default=40, help="approximate mock transcript size")
+    lemma_table.add_argument("--repeat", type=int, default=3, help="timing runs (best is reported)")
+    lemma_table.set_defaults(run=run_lemma_table)
+    corpus = commands.add_parser("corpus", help="token-ID corpus vs split strings: memory, vectorized counts, .npz round trip")
+    corpus.add_argument("--repeat", type=int, default=3, help="timing runs (best is reported)")
+    corpus.set_defaults(run=run_corpus)
+    timestamps = commands.add_parser("timestamps", help="nearby-timestamp lookup: bisect index vs windowed findall")
+    timestamps.add_argument("--episodes", type=int, default=5, help="mock transcripts")
+    timestamps.add_argument("--transcript-kb", type=float, default=100, help="approximate transcript size")
+    timestamps.add_argument("--windows", type=int, nargs="+", default=[tt.NEARBY_WINDOW, 500, 5000],
+                            help="context sizes (characters each side) to try")
+    timestamps.set_defaults(run=run_timestamps)
+    analysis = commands.add_parser("analysis", help="process-pool analysis stage: parity and throughput per worker count")
+    analysis.add_argument("--episodes", type=int, default=64, help="transcripts to analyze")
+    analysis.add_argument("--transcript-kb", type=float, default=40, help="approximate transcript size")
+    analysis.add_argument("--chunk-size", type=int, default=tt.ANALYSIS_CHUNK_SIZE, help="episodes per worker task")
+    analysis.add_argument("--workers", type=int, nargs="+", help="worker counts to try (default: 1, 2, 4, ... up to the CPU count)")
+    analysis.set_defaults(run=run_analysis)
+    imports = commands.add_parser("imports", help="cold-start time of import tv_transcript / --help and heavy modules loaded")
+    imports.add_argument("--repeat", type=int, default=7, help="timing runs (best is reported)")
+    imports.add_argument("--top", type=int, default=8, help="slowest modules to list from -X importtime")
+    imports.set_defaults(run=run_imports)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    logging.getLogger("tv_transcript").setLevel(logging.WARNING)
+    if not args.run(args):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for transcripts.foreverdreaming.org.
+
+Serves synthetic phpBB pages in the shape tv_transcript.py parses ('forumtitle'
+and 'topictitle' links, 'postbody' divs, numbered start= pagination and 'Next'
+links), with configurable latency, 429/5xx injection and slow bodies, so the
+crawler can be tested and benchmarked without the network:
+
+    python mock_forum_server.py --port 8000 --shows 200 --episodes 120 --latency-ms 80
+    python tv_transcript.py "Mock Show 7" --base-url http://127.0.0.1:8000
+"""
+import json
+import math
+import time
+import random
+import hashlib
+import logging
+import argparse
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Tuple, Any, Optional
+from urllib.parse import urlsplit, parse_qs
+
+# ------------------------------------------------------------------------------
+# Configuration
+# ------------------------------------------------------------------------------
+TV_SHOWS_FORUM_ID: int = 1662
+FIRST_SHOW_FORUM_ID: int = 2000
+
+# Vocabulary for generated transcripts; includes words the annotators look for
+FILLER_WORDS: List[str] = (
+    "the a to and of you i it that is what we in this he for on me your be have not "
+    "gotham city night alfred cave car mask villain joker robin rooftop signal warehouse "
+    "detective commissioner gordon case clue bridge harbor alley street rain chase".split()
+)
+KEYWORD_PHRASES: List[str] = [
+    "corruption", "mistakes", "family and friends", "integrity", "police solve case",
+    "use of technology", "sorry", "understand", "fight", "strong", "hope", "blame",
+]
+SPEAKERS: List[str] = ["BATMAN", "ALFRED", "GORDON", "ROBIN", "JOKER", "BULLOCK"]
+
+logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MockForumConfig:
+    """Shape of the synthetic forum and the faults injected into responses."""
+    shows: int = 50
+    episodes: int = 40                 # topics per show forum
+    topics_per_page: int = 25          # phpBB 'topics per page'
+    shows_per_page: int = 25
+    transcript_kb: float = 5.0         # approximate size of each transcript
+    posts_per_topic: int = 1           # transcript split over this many posts by the same author
+    replies: int = 0                   # comment posts by other members mixed into each topic
+    posts_per_page: int = 10           # phpBB 'posts per page'
+    page_numbers: bool = True          # emit numbered start= links, not just 'Next'
+    latency_ms: float = 0.0            # mean added latency per response
+    latency_dist: str = "fixed"        # fixed | uniform | exponential | lognormal
+    rate_429: float = 0.0              # fraction of responses answered with 429
+    rate_5xx: float = 0.0              # fraction of responses answered with 503
+    retry_after: int = 1
+    slow_body_rate: float = 0.0        # fraction of responses trickled out slowly
+    slow_body_kbps: float = 16.0
+    content_type: str = "text/html; charset=UTF-8"   # "" sends no Content-Type header at all
+    seed: int = 0
+
+# ------------------------------------------------------------------------------
+# Page Rendering
+# ------------------------------------------------------------------------------
+class MockForum:
+    """Deterministic generator of forum pages; rendering needs no server."""
+
+    def __init__(self, config: MockForumConfig) -> None:
+        self.config: MockForumConfig = config
+
+    def _rng(self, *key: Any) -> random.Random:
+        return random.Random(f"{self.config.seed}:" + ":".join(str(k) for k in key))
+
+    # -- naming ----------------------------------------------------------------
+    @staticmethod
+    def show_title(show: int) -> str:
+        return f"Mock Show {show}"
+
+    @staticmethod
+    def episode_title(show: int, episode: int) -> str:
+        season, number = divmod(episode, 20)
+        return f"{season + 1:02d}x{number + 1:02d} - S{season + 1:02d}E{number + 1:02d} Episode {episode + 1} of show {show}"
+
+    @staticmethod
+    def topic_id(show: int, episode: int) -> int:
+        return (show + 1) * 100000 + episode
+
+    # -- building blocks -------------------------------------------------------
+    @staticmethod
+    def _chrome(title: str, body: str) -> str:
+        """Wrap content in header, navigation, sidebar and footer like a real board page."""
+        nav: str = "".join(f'<li><a href="./viewforum.php?f={i}">Board {i}</a></li>' for i in range(1, 31))
+        sidebar: str = "".join(
+            f'<div class="ad-slot"><a href="https://ads.example.com/{i}"><img src="/ad{i}.png" alt="ad"></a>'
+            f'<p>Sponsored message number {i} with some filler copy.</p></div>'
+            for i in range(12)
+        )
+        footer: str = "".join(f'<a href="./faq.php#f{i}">FAQ entry {i}</a> ' for i in range(20))
+        return (
+            "<!DOCTYPE html>\n<html dir=\"ltr\" lang=\"en-gb\"><head><meta charset=\"utf-8\">"
+            f"<title>{title} - ForeverDreaming</title>"
+            "<link href=\"./styles/prosilver/theme/stylesheet.css\" rel=\"stylesheet\">"
+            "<script>var board = {name: 'mock'}; function noop() {}</script></head>"
+            f"<body id=\"phpbb\"><div id=\"wrap\"><div class=\"headerbar\"><h1>{title}</h1>"
+            f"<ul class=\"nav-main\">{nav}</ul></div>"
+            f"<div id=\"sidebar\">{sidebar}</div>"
+            f"<div id=\"page-body\">{body}</div>"
+            f"<div id=\"page-footer\">{footer}<p>Powered by phpBB</p></div>"
+            "</div></body></html>"
+        )
+
+    def _pagination(self, base: str, start: int, total: int, per_page: int, label: str = "topics") -> str:
+        """phpBB-style pagination block: numbered start= links plus a 'Next' link."""
+        links: List[str] = []
+        pages: int = max(1, math.ceil(total / per_page))
+        current: int = start // per_page
+        if self.config.page_numbers and pages > 1:
+            shown = sorted({0, 1, 2, current - 1, current, current + 1, pages - 1} & set(range(pages)))
+            for page in shown:
+                if page == current:
+                    links.append(f'<li class="active"><span>{page + 1}</span></li>')
+                else:
+                    links.append(f'<li><a class="button" href="{base}&amp;start={page * per_page}">{page + 1}</a></li>')
+        if start + per_page < total:
+            links.append(f'<li class="arrow next"><a href="{base}&amp;start={start + per_page}" rel="next">Next</a></li>')
+        return f'<div class="pagination">{total} {label}<ul>{"".join(links)}</ul></div>'
+
+    def _transcript_lines(self, show: int, episode: int) -> List[str]:
+        rng: random.Random = self._rng("transcript", show, episode)
+        target: int = int(self.config.transcript_kb * 1024)
+        lines: List[str] = []
+        size: int = 0
+        seconds: int = 0
+        while size < target:
+            seconds += rng.randint(2, 9)
+            words: List[str] = [rng.choice(FILLER_WORDS) for _ in range(rng.randint(5, 16))]
+            if rng.random() < 0.15:
+                words.insert(rng.randrange(len(words)), rng.choice(KEYWORD_PHRASES))
+            stamp: str = f"[{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}] " if rng.random() < 0.3 else ""
+            line: str = f"{stamp}{rng.choice(SPEAKERS)}: {' '.join(words).capitalize()}."
+            lines.append(line)
+            size += len(line) + 5
+        return lines
+
+    def topic_posts(self, show: int, episode: int) -> List[Tuple[str, str]]:
+        """All posts of a topic as (author, html): transcript parts in order, with replies mixed in."""
+        lines: List[str] = self._transcript_lines(show, episode)
+        parts: int = max(1, self.config.posts_per_topic)
+        size: int = math.ceil(len(lines) / parts)
+        posts: List[Tuple[str, str]] = [
+            ("bunniefuu", "<br>\n".join(lines[i * size:(i + 1) * size])) for i in range(parts)
+        ]
+        rng: random.Random = self._rng("replies", show, episode)
+        for reply in range(self.config.replies):
+            posts.insert(rng.randint(1, len(posts)), (f"viewer{reply}", "Thanks for posting this one! Great episode."))
+        return posts
+
+    # -- pages -----------------------------------------------------------------
+    def tv_shows_page(self, start: int) -> str:
+        cfg = self.config
+        rows: str = "".join(
+            f'<li class="row"><dl><dt><a href="./viewforum.php?f={FIRST_SHOW_FORUM_ID + show}" '
+            f'class="forumtitle notranslate">{self.show_title(show)}</a>'
+            f'<br>Transcripts for {self.show_title(show)}</dt><dd class="topics">{cfg.episodes}</dd></dl></li>'
+            for show in range(start, min(start + cfg.shows_per_page, cfg.shows))
+        )
+        base: str = f"./viewforum.php?f={TV_SHOWS_FORUM_ID}"
+        body: str = f'<ul class="topiclist forums">{rows}</ul>' + self._pagination(base, start, cfg.shows, cfg.shows_per_page)
+        return self._chrome("TV Shows", body)
+
+    def show_forum_page(self, show: int, start: int) -> str:
+        cfg = self.config
+        rows: str = "".join(
+            f'<li class="row"><dl><dt><a href="./viewtopic.php?t={self.topic_id(show, episode)}" '
+            f'class="topictitle">{self.episode_title(show, episode)}</a>'
+            f'<br>by <a class="username" href="./memberlist.php?u=2">bunniefuu</a></dt></dl></li>'
+            for episode in range(start, min(start + cfg.topics_per_page, cfg.episodes))
+        )
+        base: str = f"./viewforum.php?f={FIRST_SHOW_FORUM_ID + show}"
+        body: str = f'<ul class="topiclist topics">{rows}</ul>' + self._pagination(base, start, cfg.episodes, cfg.topics_per_page)
+        return self._chrome(self.show_title(show), body)
+
+    def topic_page(self, show: int, episode: int, start: int = 0) -> str:
+        cfg = self.config
+        title: str = self.episode_title(show, episode)
+        posts: List[Tuple[str, str]] = self.topic_posts(show, episode)
+        rendered: List[str] = []
+        for number in range(start, min(start + cfg.posts_per_page, len(posts))):
+            author, content = posts[number]
+            heading: str = title if number == 0 else f"Re: {title}"
+            rendered.append(
+                f'<div class="post bg{number % 2 + 1}"><div class="inner"><div class="postbody"><div id="post_content{number}">'
+                f'<h3><a href="#p{number}">{heading}</a></h3>'
+                f'<p class="author">by <strong><a class="username" href="./memberlist.php?un={author}">{author}</a></strong></p>'
+                f'<div class="content">{content}</div></div></div></div></div>'
+            )
+        base: str = f"./viewtopic.php?t={self.topic_id(show, episode)}"
+        body: str = "".join(rendered) + self._pagination(base, start, len(posts), cfg.posts_per_page, "posts")
+        return self._chrome(title, body)
+
+    def route(self, path: str, query: Dict[str, List[str]]) -> Optional[str]:
+        """Render the page for a request path, or None for a 404."""
+        start: int = int(query.get("start", ["0"])[0])
+        if path.endswith("/viewforum.php") and "f" in query:
+            forum: int = int(query["f"][0])
+            if forum == TV_SHOWS_FORUM_ID:
+                return self.tv_shows_page(start)
+            show: int = forum - FIRST_SHOW_FORUM_ID
+            if 0 <= show < self.config.shows:
+                return self.show_forum_page(show, start)
+        if path.endswith("/viewtopic.php") and "t" in query:
+            show, episode = divmod(int(query["t"][0]), 100000)
+            show -= 1
+            if 0 <= show < self.config.shows and 0 <= episode < self.config.episodes:
+                return self.topic_page(show, episode, start)
+        return None
+
+# ------------------------------------------------------------------------------
+# HTTP Server
+# ------------------------------------------------------------------------------
+class ServerStats:
+    """Counters exposed at /_stats."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {"requests": 0, "ok": 0, "not_modified": 0,
+                                       "throttled": 0, "errors": 0, "slow": 0, "bytes": 0}
+
+    def add(self, **increments: int) -> None:
+        with self._lock:
+            for key, value in increments.items():
+                self.counts[key] += value
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
+
+
+def sample_latency(config: MockForumConfig, rng: random.Random) -> float:
+    """Draw one response delay in seconds from the configured distribution."""
+    mean: float = config.latency_ms / 1000.0
+    if mean <= 0:
+        return 0.0
+    if config.latency_dist == "uniform":
+        return rng.uniform(0, 2 * mean)
+    if config.latency_dist == "exponential":
+        return rng.expovariate(1 / mean)
+    if config.latency_dist == "lognormal":
+        sigma: float = 0.8
+        return rng.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+    return mean
+
+
+def make_handler(forum: MockForum, stats: ServerStats) -> type:
+    """Build a keep-alive request handler class bound to `forum`."""
+    config: MockForumConfig = forum.config
+    rng: random.Random = random.Random(config.seed)
+    rng_lock: threading.Lock = threading.Lock()
+
+    class MockForumHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug(format % args)
+
+        def _send(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None) -> None:
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            parts = urlsplit(self.path)
+            if parts.path == "/_stats":
+                self._send(200, json.dumps(stats.snapshot()).encode("utf-8"), {"Content-Type": "application/json"})
+                return
+            stats.add(requests=1)
+            with rng_lock:
+                delay: float = sample_latency(config, rng)
+                fault: float = rng.random()
+                slow: bool = rng.random() < config.slow_body_rate
+            time.sleep(delay)
+
+            if fault < config.rate_429:
+                stats.add(throttled=1)
+                self._send(429, b"Too Many Requests", {"Retry-After": str(config.retry_after)})
+                return
+            if fault < config.rate_429 + config.rate_5xx:
+                stats.add(errors=1)
+                self._send(503, b"Service Unavailable")
+                return
+
+            page: Optional[str] = forum.route(parts.path, parse_qs(parts.query))
+            if page is None:
+                self._send(404, b"Not Found")
+                return
+            body: bytes = page.encode("utf-8")
+            etag: str = '"' + hashlib.sha1(body).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                stats.add(not_modified=1)
+                self._send(304, headers={"ETag": etag})
+                return
+
+            stats.add(ok=1, bytes=len(body))
+            headers: Dict[str, str] = {"ETag": etag}
+            if config.content_type:
+                headers["Content-Type"] = config.content_type
+            if not slow:
+                self._send(200, body, headers)
+                return
+            # Trickle the body out in small chunks at the configured rate
+            stats.add(slow=1)
+            self.send_response(200)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            chunk_size: int = 1024
+            for offset in range(0, len(body), chunk_size):
+                self.wfile.write(body[offset:offset + chunk_size])
+                self.wfile.flush()
+                time.sleep(chunk_size / (config.slow_body_kbps * 1024))
+
+    return MockForumHandler
+
+
+def start_server(config: MockForumConfig, host: str = "127.0.0.1", port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the mock forum on a background thread; returns the server and its base URL."""
+    stats = ServerStats()
+    server = ThreadingHTTPServer((host, port), make_handler(MockForum(config), stats))
+    server.daemon_threads = True
+    server.stats = stats
+    thread = threading.Thread(target=server.serve_forever, name="mock-forum", daemon=True)
+    thread.start()
+    base_url: str = f"http://{host}:{server.server_address[1]}"
+    logger.info(f"Mock forum serving {config.shows} shows x {config.episodes} episodes at {base_url}")
+    return server, base_url
+
+# ------------------------------------------------------------------------------
+# Main Entry Point
+# ------------------------------------------------------------------------------
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    defaults = MockForumConfig()
+    parser = argparse.ArgumentParser(description="Serve a synthetic ForeverDreaming forum for offline crawling.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--shows", type=int, default=defaults.shows)
+    parser.add_argument("--episodes", type=int, default=defaults.episodes, help="topics per show forum")
+    parser.add_argument("--topics-per-page", type=int, default=defaults.topics_per_page)
+    parser.add_argument("--shows-per-page", type=int, default=defaults.shows_per_page)
+    parser.add_argument("--transcript-kb", type=float, default=defaults.transcript_kb)
+    parser.add_argument("--posts-per-topic", type=int, default=defaults.posts_per_topic,
+                        help="split each transcript over this many posts")
+    parser.add_argument("--replies", type=int, default=defaults.replies,
+                        help="comment posts by other members per topic")
+    parser.add_argument("--posts-per-page", type=int, default=defaults.posts_per_page)
+    parser.add_argument("--no-page-numbers", action="store_true",
+                        help="paginate with 'Next' links only")
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "exponential", "lognormal"],
+                        default=defaults.latency_dist)
+    parser.add_argument("--rate-429", type=float, default=defaults.rate_429)
+    parser.add_argument("--rate-5xx", type=float, default=defaults.rate_5xx)
+    parser.add_argument("--retry-after", type=int, default=defaults.retry_after)
+    parser.add_argument("--slow-body-rate", type=float, default=defaults.slow_body_rate)
+    parser.add_argument("--slow-body-kbps", type=float, default=defaults.slow_body_kbps)
+    parser.add_argument("--content-type", default=defaults.content_type,
+                        help="Content-Type of pages; drop the charset to make clients sniff <meta>, '' to omit it")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    config = MockForumConfig(
+        shows=args.shows,
+        episodes=args.episodes,
+        topics_per_page=args.topics_per_page,
+        shows_per_page=args.shows_per_page,
+        transcript_kb=args.transcript_kb,
+        posts_per_topic=args.posts_per_topic,
+        replies=args.replies,
+        posts_per_page=args.posts_per_page,
+        page_numbers=not args.no_page_numbers,
+        latency_ms=args.latency_ms,
+        latency_dist=args.latency_dist,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        retry_after=args.retry_after,
+        slow_body_rate=args.slow_body_rate,
+        slow_body_kbps=args.slow_body_kbps,
+        content_type=args.content_type,
+        seed=args.seed,
+    )
+    server, base_url = start_server(config, args.host, args.port)
+    logger.info(f"Crawl it with: python tv_transcript.py \"{MockForum.show_title(0)}\" --base-url {base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        logger.info(f"Shutting down; stats: {server.stats.snapshot()}")
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -1,24 +1,63 @@
 #!/usr/bin/env python3
+from __future__ import annotations
+
 import re
+import sys
 import csv
+import os
 import json
+import mmap
+import time
+import gzip
+import uuid
+import zlib
+import codecs
+import bisect
+import random
+import struct
+import hashlib
 import logging
-from typing import List, Dict, Tuple, Any, Optional
-from urllib.parse import urljoin
+import argparse
+import threading
+import importlib.util
+from array import array
+from collections import Counter
+from itertools import chain
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Dict, Tuple, Any, Optional, Callable, NamedTuple, Iterator, Iterable, Union, FrozenSet, Set, TYPE_CHECKING
+from urllib.parse import urljoin, urlsplit, parse_qsl
+from html import unescape as html_unescape
+from html.entities import html5 as HTML5_ENTITIES
+from html.parser import HTMLParser
+
 
-import requests
-from bs4 import BeautifulSoup
+def _lazy_import(name: str) -> Any:
+    """
+    Return module `name`, executing it only on first attribute access (importlib's
+    LazyLoader), so `import tv_transcript` and `--help` don't pay for requests or asyncio.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
 
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
 
-# Download required NLTK resources
-nltk.download('punkt')
-nltk.download('punkt_tab')
-nltk.download('stopwords')
-nltk.download('wordnet')
+# Heavy dependencies load on first use: requests/asyncio through these proxies,
+# bs4 and NLTK (whose data is verified once, see ensure_nltk_resources) where they're needed
+if TYPE_CHECKING:
+    import asyncio
+    import requests
+    from nltk.stem import WordNetLemmatizer
+else:
+    requests = _lazy_import("requests")
+    asyncio = _lazy_import("asyncio")
 
 # ------------------------------------------------------------------------------
 # Constants & Regex Patterns
@@ -27,7 +66,15 @@ BASE_URL: str = "https://transcripts.foreverdreaming.org"
 TV_SHOWS_URL: str = urljoin(BASE_URL, "/viewforum.php?f=1662")  
 EPISODE_REGEX: re.Pattern = re.compile(r'[Ss](\d+)[Ee](\d+)')
 TIMESTAMP_REGEX: re.Pattern = re.compile(r'\[?\d{1,2}:\d{2}(?::\d{2})?\]?')
+HTML_TAG_REGEX: re.Pattern = re.compile(r'<[^>]+>')
+WHITESPACE_REGEX: re.Pattern = re.compile(r'\s+')
+START_OFFSET_REGEX: re.Pattern = re.compile(r'([?&](?:amp;)?start=)(\d+)')
 NEARBY_WINDOW: int = 50
+PAGINATION_CONCURRENCY: int = 4   # extra listing/topic pages fetched at once on the serial path
+STREAM_CHUNK_SIZE: int = 16 * 1024  # bytes read at a time when streaming topic pages
+CHARSET_PRESCAN_BYTES: int = 1024   # how far into a page <meta charset> is looked for, as browsers do
+CONTENT_TYPE_CHARSET_REGEX: re.Pattern = re.compile(r'charset\s*=\s*["\']?([^"\';\s]+)', re.I)
+META_CHARSET_REGEX: re.Pattern = re.compile(rb'<meta[^>]*?charset\s*=\s*["\']?\s*([a-zA-Z0-9_.:-]+)', re.I)
 
 NEGATIVE_ELEMENTS: Dict[str, str] = {
     "racism": r'\bracism\b',
@@ -64,287 +111,3082 @@ logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger: logging.Logger = logging.getLogger(__name__)
 
 # ------------------------------------------------------------------------------
-# Utility Functions
+# HTTP Session Layer
 # ------------------------------------------------------------------------------
-def fetch_page(url: str) -> str:
-    """Retrieve the HTML content of a given URL."""
-    logger.info(f"Fetching URL: {url}")
-    response = requests.get(url)
-    response.raise_for_status()
-    logger.debug(f"Fetched {len(response.text)} characters from {url}")
-    return response.text
+@dataclass
+class SessionConfig:
+    """Connection-pool and timeout settings for the shared HTTP session."""
+    pool_connections: int = 10      # number of per-host pools kept alive
+    pool_maxsize: int = 10          # max open connections per host
+    pool_block: bool = False        # wait for a free connection instead of opening extras
+    connect_timeout: float = 10.0
+    read_timeout: float = 30.0
 
 
-def extract_season_episode(title: str) -> Tuple[Optional[str], Optional[str]]:
-    """Extract 'SxxExx' pattern from the episode title (if present)."""
-    match = EPISODE_REGEX.search(title)
-    if match:
-        season, episode = match.groups()
-        logger.debug(f"Extracted season: {season}, episode: {episode} from title: {title}")
-        return season, episode
-    logger.debug(f"No season/episode info found in title: {title}")
-    return None, None
+class ConnectionStats:
+    """Thread-safe per-host counters of requests and newly opened connections."""
 
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, int]] = {}
 
-def clean_transcript(raw_text: str) -> str:
-    """Convert text to lowercase, remove HTML tags, timestamps, and extra whitespace."""
-    logger.info("Cleaning transcript text")
-    text: str = raw_text.lower()
-    text = re.sub(r'<[^>]+>', '', text)         # remove HTML tags
-    text = re.sub(TIMESTAMP_REGEX, '', text)    # remove timestamps like [00:01:23]
-    text = re.sub(r'\s+', ' ', text).strip()    # remove extra whitespace
-    logger.debug(f"Cleaned transcript (first 100 chars): {text[:100]}...")
-    return text
+    def record(self, host: str, reused: bool) -> None:
+        with self._lock:
+            counters = self._hosts.setdefault(host, {"requests": 0, "new_connections": 0, "reused": 0})
+            counters["requests"] += 1
+            counters["reused" if reused else "new_connections"] += 1
 
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Return a copy of the counters with a reuse ratio per host."""
+        with self._lock:
+            report: Dict[str, Dict[str, Any]] = {}
+            for host, counters in self._hosts.items():
+                report[host] = dict(counters)
+                report[host]["reuse_ratio"] = round(counters["reused"] / counters["requests"], 3)
+            return report
 
-def tokenize_and_lemmatize(text: str) -> str:
-    """Tokenize, remove stopwords/punctuation, and lemmatize the transcript."""
-    logger.info("Tokenizing and lemmatizing transcript")
-    tokens: List[str] = word_tokenize(text)
-    stop_words: set = set(stopwords.words('english'))
-    lemmatizer: WordNetLemmatizer = WordNetLemmatizer()
-    processed_tokens: List[str] = [
-        lemmatizer.lemmatize(token) for token in tokens if token.isalnum() and token not in stop_words
-    ]
-    final_text: str = ' '.join(processed_tokens)
-    logger.debug(f"Processed tokens (first 20): {processed_tokens[:20]}")
-    return final_text
+    def reset(self) -> None:
+        with self._lock:
+            self._hosts.clear()
 
 
-def annotate_story_elements(transcript: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+# Number of TCP connections opened by the current thread's in-flight request
+_connect_events: threading.local = threading.local()
+
+
+@lru_cache(maxsize=None)
+def _pooled_adapter_class() -> type:
+    """HTTPAdapter subclass whose pools count every fresh TCP connect (defined once requests is needed)."""
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class CountingHTTPConnection(HTTPConnection):
+        def connect(self) -> None:
+            _connect_events.count = getattr(_connect_events, "count", 0) + 1
+            super().connect()
+
+    class CountingHTTPSConnection(HTTPSConnection):
+        def connect(self) -> None:
+            _connect_events.count = getattr(_connect_events, "count", 0) + 1
+            super().connect()
+
+    class CountingHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = CountingHTTPConnection
+
+    class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = CountingHTTPSConnection
+
+    class PooledAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": CountingHTTPConnectionPool,
+                "https": CountingHTTPSConnectionPool,
+            }
+
+    return PooledAdapter
+
+
+# Exceptions derived from requests.RequestException, created with requests on first use
+_LAZY_EXCEPTIONS: Dict[str, str] = {
+    "CircuitOpenError": "Raised when a host's circuit stays open past the request deadline.",
+    "ArchiveMissError": "Raised in replay mode when the archive holds no response for a URL.",
+}
+
+
+def _lazy_exception(name: str) -> type:
+    cls: Optional[type] = globals().get(name)
+    if cls is None:
+        cls = globals()[name] = type(name, (requests.RequestException,),
+                                     {"__doc__": _LAZY_EXCEPTIONS[name], "__module__": __name__})
+    return cls
+
+
+def __getattr__(name: str) -> Any:
+    """Module attribute hook (PEP 562) that creates the lazy exception classes on access."""
+    if name in _LAZY_EXCEPTIONS:
+        return _lazy_exception(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_session_config: SessionConfig = SessionConfig()
+_session: Optional[requests.Session] = None
+_session_lock: threading.Lock = threading.Lock()
+connection_stats: ConnectionStats = ConnectionStats()
+
+
+def configure_session(config: SessionConfig) -> None:
+    """Replace the shared session settings; the pool is rebuilt on next use."""
+    global _session_config, _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session_config = config
+        _session = None
+
+
+def get_session() -> requests.Session:
+    """Return the shared keep-alive session, creating its connection pools on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            adapter = _pooled_adapter_class()(
+                pool_connections=_session_config.pool_connections,
+                pool_maxsize=_session_config.pool_maxsize,
+                pool_block=_session_config.pool_block,
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+            logger.debug(f"Created HTTP session with {_session_config}")
+        return _session
+
+
+# ------------------------------------------------------------------------------
+# Adaptive Rate Limiting
+# ------------------------------------------------------------------------------
+@dataclass
+class RateLimitConfig:
+    """Token-bucket and AIMD settings applied independently to every host."""
+    initial_rate: float = 2.0          # requests per second
+    min_rate: float = 0.2
+    max_rate: float = 50.0
+    rate_step: float = 0.5             # rate gained per second of healthy traffic
+    initial_concurrency: float = 2.0
+    max_concurrency: float = 32.0
+    decrease_factor: float = 0.5       # multiplicative cut on 429/5xx/slow responses
+    latency_target: float = 2.0        # responses slower than this count as congestion
+    default_backoff: float = 5.0       # pause after 429/5xx without a Retry-After header
+
+
+class _HostState:
+    def __init__(self, config: RateLimitConfig) -> None:
+        self.rate: float = config.initial_rate
+        self.concurrency: float = min(config.initial_concurrency, config.max_concurrency)
+        self.tokens: float = 1.0
+        self.in_flight: int = 0
+        self.last_refill: float = time.monotonic()
+        self.backoff_until: float = 0.0
+        self.last_decrease: float = 0.0
+        self.throttled: int = 0
+
+    def refill(self, now: float) -> None:
+        # Bucket depth of one second's worth of tokens bounds bursts after idle periods
+        self.tokens = min(max(1.0, self.rate), self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+
+class HostRateLimiter:
     """
-    Find occurrences of negative and positive story elements in the transcript text.
-    For negative elements, store counts + timestamps.
-    For positive elements, store counts + up to 3 'checks' with local context.
+    Per-host token bucket whose rate and concurrency adapt by AIMD:
+    every healthy response adds a little rate and concurrency, while a 429, 5xx,
+    connection failure or over-target latency halves both (at most once per
+    latency_target window) and, for 429/5xx, pauses the host.
     """
-    logger.info("Annotating story elements")
-    negative_annotations: Dict[str, Any] = {}
-    positive_annotations: Dict[str, Any] = {}
-
-    # Negative elements
-    for element, pattern in NEGATIVE_ELEMENTS.items():
-        regex = re.compile(pattern, re.IGNORECASE)
-        matches = list(regex.finditer(transcript))
-        count: int = len(matches)
-        timestamps: List[str] = []
-        for match in matches:
-            start = max(0, match.start() - NEARBY_WINDOW)
-            end = match.end() + NEARBY_WINDOW
-            nearby_text = transcript[start:end]
-            ts_matches = TIMESTAMP_REGEX.findall(nearby_text)
-            timestamps.extend(ts_matches)
-            logger.debug(f"Negative element '{element}' found at position {match.start()} with timestamps: {ts_matches}")
-        negative_annotations[element] = {"count": count, "timestamps": timestamps}
-
-    # Positive elements
-    for element, pattern in POSITIVE_ELEMENTS.items():
-        regex = re.compile(pattern, re.IGNORECASE)
-        matches = list(regex.finditer(transcript))
-        count: int = len(matches)
-        checks: List[Dict[str, Any]] = []
-        # Only store up to 3 checks
-        for i, match in enumerate(matches):
-            if i >= 3:
-                break
-            start = max(0, match.start() - NEARBY_WINDOW)
-            end = match.end() + NEARBY_WINDOW
-            nearby_text = transcript[start:end]
-            ts_matches = TIMESTAMP_REGEX.findall(nearby_text)
-            checks.append({"check": f"Check {i+1}", "timestamps": ts_matches})
-            logger.debug(f"Positive element '{element}' found at position {match.start()} with timestamps: {ts_matches}")
-        positive_annotations[element] = {"count": count, "checks": checks}
 
-    return negative_annotations, positive_annotations
+    def __init__(self, config: Optional[RateLimitConfig] = None) -> None:
+        self.config: RateLimitConfig = config or RateLimitConfig()
+        self._cond = threading.Condition()
+        self._hosts: Dict[str, _HostState] = {}
 
+    def acquire(self, host: str) -> None:
+        """Block until `host` has both a token and a free concurrency slot."""
+        with self._cond:
+            state = self._hosts.setdefault(host, _HostState(self.config))
+            while True:
+                now: float = time.monotonic()
+                state.refill(now)
+                if now < state.backoff_until:
+                    wait: Optional[float] = state.backoff_until - now
+                elif state.in_flight >= max(1, int(state.concurrency)):
+                    wait = None
+                elif state.tokens < 1.0:
+                    wait = (1.0 - state.tokens) / state.rate
+                else:
+                    state.tokens -= 1.0
+                    state.in_flight += 1
+                    return
+                self._cond.wait(timeout=wait)
 
-def analyze_narrative_tone(transcript: str) -> Dict[str, Any]:
+    def release(self, host: str, status_code: Optional[int], latency: float,
+                retry_after: Optional[float] = None) -> None:
+        """Report a finished request; `status_code` is None for connection errors."""
+        cfg = self.config
+        with self._cond:
+            state = self._hosts[host]
+            state.in_flight -= 1
+            now: float = time.monotonic()
+            overloaded: bool = status_code is None or status_code == 429 or status_code >= 500
+            if overloaded or latency > cfg.latency_target:
+                if now - state.last_decrease >= cfg.latency_target:
+                    state.rate = max(cfg.min_rate, state.rate * cfg.decrease_factor)
+                    state.concurrency = max(1.0, state.concurrency * cfg.decrease_factor)
+                    state.last_decrease = now
+                if overloaded:
+                    state.throttled += 1
+                    pause: float = retry_after if retry_after is not None else cfg.default_backoff
+                    state.backoff_until = max(state.backoff_until, now + pause)
+                    logger.warning(f"Backing off {host} for {pause:.1f}s after "
+                                   f"{status_code or 'connection error'}; rate now {state.rate:.2f}/s")
+            else:
+                state.rate = min(cfg.max_rate, state.rate + cfg.rate_step / state.rate)
+                state.concurrency = min(cfg.max_concurrency, state.concurrency + 1.0 / state.concurrency)
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current rate, concurrency and backoff state per host."""
+        with self._cond:
+            now: float = time.monotonic()
+            return {
+                host: {
+                    "rate": round(state.rate, 3),
+                    "concurrency": int(state.concurrency),
+                    "in_flight": state.in_flight,
+                    "backoff_remaining": round(max(0.0, state.backoff_until - now), 3),
+                    "throttled_responses": state.throttled,
+                }
+                for host, state in self._hosts.items()
+            }
+
+
+_rate_limiter: Optional[HostRateLimiter] = None
+
+
+def configure_rate_limiter(limiter: Optional[HostRateLimiter]) -> None:
+    """Install (or remove, with None) the per-host limiter applied to network requests."""
+    global _rate_limiter
+    _rate_limiter = limiter
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parse a numeric Retry-After header (HTTP-date values are ignored)."""
+    value: Optional[str] = response.headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+# ------------------------------------------------------------------------------
+# Retries & Circuit Breaking
+# ------------------------------------------------------------------------------
+@dataclass
+class RetryPolicy:
+    """How fetch_page retries transient failures and when it gives up on a host."""
+    max_attempts: int = 4
+    base_delay: float = 0.5            # first backoff ceiling; doubles per attempt
+    max_delay: float = 30.0
+    deadline: float = 120.0            # total seconds one fetch may take, retries included
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    breaker_threshold: int = 5         # consecutive failures that open a host's circuit
+    breaker_cooldown: float = 60.0     # seconds a host stays paused once its circuit opens
+
+
+class CircuitBreaker:
     """
-    Count occurrences of tone keywords in the transcript
-    (e.g., empathetic, resolute, critical, optimistic).
+    Per-host circuit breaker. After `threshold` consecutive failures the host is
+    paused for `cooldown` seconds; the next request afterwards is a trial that
+    closes the circuit on success or reopens it on failure.
     """
-    logger.info("Performing narrative tone analysis")
-    tone_counts: Dict[str, int] = {tone: 0 for tone in TONE_KEYWORDS}
-    tokens: List[str] = word_tokenize(transcript.lower())
 
-    for token in tokens:
-        for tone, keywords in TONE_KEYWORDS.items():
-            if token in keywords:
-                tone_counts[tone] += 1
-                logger.debug(f"Token '{token}' contributes to tone '{tone}'")
+    def __init__(self, threshold: int, cooldown: float) -> None:
+        self.threshold: int = threshold
+        self.cooldown: float = cooldown
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._open_until: Dict[str, float] = {}
+
+    def wait_until_closed(self, host: str, deadline: float) -> None:
+        """Sleep while the host is paused; raise if the pause outlasts `deadline`."""
+        with self._lock:
+            open_until: float = self._open_until.get(host, 0.0)
+        now: float = time.monotonic()
+        if open_until <= now:
+            return
+        if open_until >= deadline:
+            raise _lazy_exception("CircuitOpenError")(f"Circuit open for {host} for another {open_until - now:.1f}s")
+        logger.warning(f"Circuit open for {host}; pausing {open_until - now:.1f}s")
+        time.sleep(open_until - now)
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._failures[host] = 0
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            failures: int = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.threshold:
+                self._open_until[host] = time.monotonic() + self.cooldown
+                logger.error(f"{failures} consecutive failures from {host}; "
+                             f"opening circuit for {self.cooldown:.0f}s")
+
+
+_retry_policy: RetryPolicy = RetryPolicy()
+_circuit_breaker: CircuitBreaker = CircuitBreaker(_retry_policy.breaker_threshold, _retry_policy.breaker_cooldown)
+
 
-    return tone_counts
+def configure_retries(policy: RetryPolicy) -> None:
+    """Replace the retry policy and reset the circuit breaker to match it."""
+    global _retry_policy, _circuit_breaker
+    _retry_policy = policy
+    _circuit_breaker = CircuitBreaker(policy.breaker_threshold, policy.breaker_cooldown)
 
 # ------------------------------------------------------------------------------
-# Scraping Functions
+# HTTP Cache
 # ------------------------------------------------------------------------------
-def scrape_all_tv_show_forums() -> List[Dict[str, str]]:
+class HttpCache:
     """
-    Start from the 'TV Shows' forum (f=1662) and gather links to specific TV shows.
-    This function handles pagination by following the 'Next' link, if present.
-    Returns a list of dicts: {title, url}.
+    Content-addressed on-disk HTTP cache.
+    Bodies live under objects/<sha256 of body>, so identical pages are stored once;
+    meta/<sha256 of url>.json maps a URL to its body digest, encoding and validators.
+    Entries younger than `ttl` are served without a request; older ones are
+    revalidated with If-None-Match / If-Modified-Since. The meta file's mtime
+    records the last access and drives LRU eviction once bodies exceed `max_bytes`.
+    A body no meta file references any more (a page whose content changed) is deleted.
     """
-    logger.info("Scraping from the 'TV Shows' forum (f=1662).")
-    all_shows: List[Dict[str, str]] = []
-    next_page_url: str = TV_SHOWS_URL
 
-    while True:
-        html = fetch_page(next_page_url)
-        soup = BeautifulSoup(html, "html.parser")
-
-        # Each subforum for a show is typically a link with class 'forumtitle'
-        # or 'forumtitle notranslate'. We'll check both.
-        forum_links = soup.find_all('a', class_=lambda c: c and 'forumtitle' in c.split())
-        for fl in forum_links:
-            title = fl.get_text(strip=True)
-            href = fl.get('href', '')
-            full_url = urljoin(BASE_URL, href)
-            all_shows.append({"title": title, "url": full_url})
-            logger.debug(f"TV show found: {title} -> {full_url}")
-
-        # Next page for "TV Shows" forum
-        next_link = soup.find('a', string='Next')
-        if next_link and next_link.get('href'):
-            next_page_url = urljoin(BASE_URL, next_link['href'])
-            logger.info(f"Found next page under 'TV Shows': {next_page_url}")
-        else:
-            logger.info("No more pages under 'TV Shows'.")
-            break
+    def __init__(self, directory: str, ttl: float = 24 * 3600, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.directory: str = directory
+        self.ttl: float = ttl
+        self.max_bytes: int = max_bytes
+        self.stats: Dict[str, int] = {"hits": 0, "revalidated": 0, "misses": 0, "bytes_saved": 0}
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+        self._refcounts: Dict[str, int] = {}   # digest -> meta files referencing it, valid once _size is set
+        os.makedirs(os.path.join(directory, "meta"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
 
-    logger.info(f"Total sub-forums (TV shows) found: {len(all_shows)}")
-    return all_shows
+    def _meta_path(self, url: str) -> str:
+        key: str = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, "meta", f"{key}.json")
 
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", digest[:2], digest)
 
-def scrape_episode_links(show_url: str) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        tmp_path: str = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for `url` (with its body loaded), or None."""
+        meta_path: str = self._meta_path(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                entry: Dict[str, Any] = json.load(f)
+            with open(self._object_path(entry["digest"]), "rb") as f:
+                entry["body"] = f.read()
+            os.utime(meta_path)
+        except (OSError, ValueError, KeyError):
+            return None
+        return entry
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry["stored_at"] < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def refresh(self, url: str, entry: Dict[str, Any]) -> None:
+        """Restart the TTL of an entry the server confirmed unchanged (304)."""
+        meta: Dict[str, Any] = {k: v for k, v in entry.items() if k != "body"}
+        meta["stored_at"] = time.time()
+        self._write_atomic(self._meta_path(url), json.dumps(meta).encode("utf-8"))
+
+    def store(self, url: str, body: bytes, encoding: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        digest: str = hashlib.sha256(body).hexdigest()
+        object_path: str = self._object_path(digest)
+        meta_path: str = self._meta_path(url)
+        meta: Dict[str, Any] = {
+            "url": url,
+            "digest": digest,
+            "encoding": encoding,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": time.time(),
+        }
+        # Bodies and meta are written under the lock so a sweep never sees a body before its meta
+        with self._lock:
+            if self._size is None:
+                self._scan()
+            previous: Optional[str] = self._read_digest(meta_path)
+            if not os.path.exists(object_path):
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                self._write_atomic(object_path, body)
+                self._size += len(body)
+            self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+            if previous != digest:
+                self._refcounts[digest] = self._refcounts.get(digest, 0) + 1
+                if previous is not None:
+                    self._release(previous)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    @staticmethod
+    def _read_digest(meta_path: str) -> Optional[str]:
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)["digest"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _release(self, digest: str) -> None:
+        """Drop one reference to `digest`, deleting its body once nothing references it."""
+        self._refcounts[digest] -= 1
+        if self._refcounts[digest] > 0:
+            return
+        del self._refcounts[digest]
+        object_path: str = self._object_path(digest)
+        try:
+            self._size -= os.path.getsize(object_path)
+            os.remove(object_path)
+        except OSError:
+            pass
+
+    def _scan(self) -> List[Tuple[float, str, str]]:
+        """
+        Recount references from the meta files, delete bodies none of them references
+        and recompute the disk usage. Returns (mtime, meta path, digest) per entry, oldest first.
+        """
+        meta_dir: str = os.path.join(self.directory, "meta")
+        entries: List[Tuple[float, str, str]] = []
+        for name in os.listdir(meta_dir):
+            path: str = os.path.join(meta_dir, name)
+            digest: Optional[str] = self._read_digest(path)
+            if digest is None:
+                continue
+            try:
+                entries.append((os.path.getmtime(path), path, digest))
+            except OSError:
+                continue
+        entries.sort()
+
+        self._refcounts = {}
+        for _mtime, _path, digest in entries:
+            self._refcounts[digest] = self._refcounts.get(digest, 0) + 1
+
+        total: int = 0
+        orphans: int = 0
+        for root, _dirs, files in os.walk(os.path.join(self.directory, "objects")):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if name in self._refcounts or name.endswith(".tmp"):
+                        total += os.path.getsize(path)
+                    else:
+                        os.remove(path)
+                        orphans += 1
+                except OSError:
+                    continue
+        if orphans:
+            logger.info(f"HTTP cache removed {orphans} unreferenced bodies")
+        self._size = total
+        return entries
+
+    def _evict(self) -> None:
+        """Drop least recently used URLs until the bodies they reference fit in max_bytes."""
+        entries: List[Tuple[float, str, str]] = self._scan()
+        target: int = int(self.max_bytes * 0.9)
+        evicted: int = 0
+        for _mtime, path, digest in entries:
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            evicted += 1
+            self._release(digest)
+        logger.info(f"HTTP cache evicted {evicted} entries ({self._size} bytes remain)")
+
+    def record(self, outcome: str, saved_bytes: int = 0) -> None:
+        with self._lock:
+            self.stats[outcome] += 1
+            self.stats["bytes_saved"] += saved_bytes
+
+
+_http_cache: Optional[HttpCache] = None
+
+
+def configure_cache(cache: Optional[HttpCache]) -> None:
+    """Install (or remove, with None) the on-disk cache consulted by fetch_page."""
+    global _http_cache
+    _http_cache = cache
+
+# ------------------------------------------------------------------------------
+# Crawl Archive (record / replay)
+# ------------------------------------------------------------------------------
+ARCHIVE_INDEX_CHUNK: int = 64 * 1024   # compressed bytes fed to the decompressor at a time while indexing
+
+
+class CrawlArchive:
     """
-    Given the forum URL for a specific show, scrape all episode links,
-    handling multi-page 'Next' pagination in that show forum.
+    WARC-style archive of the responses fetch_page receives.
+    Each record is its own gzip member (as in .warc.gz files) holding a WARC/1.0
+    'response' record whose block is the HTTP status line, headers and decoded body.
+    In 'record' mode records are appended; in 'replay' mode the archive is indexed by
+    URL once and single members are decompressed on demand, so replay never touches
+    the network and keeps only the compressed archive in memory.
     """
-    logger.info(f"Scraping episode links from: {show_url}")
-    episodes: List[Dict[str, Any]] = []
-    next_page_url: Optional[str] = show_url
 
-    while next_page_url:
-        page_html: str = fetch_page(next_page_url)
-        soup: BeautifulSoup = BeautifulSoup(page_html, 'html.parser')
-
-        # Each episode is identified by <a class="topictitle">
-        for a_tag in soup.find_all('a', class_='topictitle'):
-            title: str = a_tag.get_text(strip=True)
-            href: str = a_tag.get('href', '')
-            episode_url: str = urljoin(BASE_URL, href)
-            season, episode = extract_season_episode(title)
-            episodes.append({
-                "title": title,
-                "season": season if season else "",
-                "episode": episode if episode else "",
-                "url": episode_url
-            })
-            logger.debug(f"Found episode: {title} (Season: {season}, Episode: {episode}) at {episode_url}")
+    # Headers describing the wire encoding no longer apply to the decoded body we store
+    _DROPPED_HEADERS = frozenset({"content-encoding", "transfer-encoding", "content-length"})
 
-        # Check for "Next" pagination link
-        next_link = soup.find('a', string='Next')
-        if next_link and next_link.get('href'):
-            next_page_url = urljoin(BASE_URL, next_link['href'])
-            logger.info(f"Found next page of episodes: {next_page_url}")
+    def __init__(self, path: str, mode: str) -> None:
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown archive mode: {mode}")
+        self.path: str = path
+        self.mode: str = mode
+        self._lock = threading.Lock()
+        self._file = None
+        self._data: bytes = b""
+        self._index: Dict[str, Tuple[int, int]] = {}
+        if mode == "record":
+            self._file = open(path, "ab")
         else:
-            next_page_url = None
+            self._load_index()
 
-    return episodes
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
 
+    def urls(self) -> List[str]:
+        """Target URIs of the archived responses (replay mode)."""
+        return list(self._index)
 
-def process_episode(episode: Dict[str, Any]) -> Dict[str, Any]:
+    def record(self, url: str, status_code: int, reason: str, headers: Dict[str, str], body: bytes) -> None:
+        """Append one response record."""
+        http_head: str = f"HTTP/1.1 {status_code} {reason}\r\n"
+        for name, value in headers.items():
+            if name.lower() not in self._DROPPED_HEADERS:
+                http_head += f"{name}: {value}\r\n"
+        http_head += f"Content-Length: {len(body)}\r\n\r\n"
+        block: bytes = http_head.encode("latin-1") + body
+        warc_head: str = (
+            "WARC/1.0\r\n"
+            "WARC-Type: response\r\n"
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+            f"WARC-Date: {time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())}\r\n"
+            f"WARC-Target-URI: {url}\r\n"
+            "Content-Type: application/http; msgtype=response\r\n"
+            f"Content-Length: {len(block)}\r\n\r\n"
+        )
+        member: bytes = gzip.compress(warc_head.encode("utf-8") + block + b"\r\n\r\n")
+        with self._lock:
+            self._file.write(member)
+            self._file.flush()
+
+    def _load_index(self) -> None:
+        """Map each target URI to the (offset, length) of its gzip member; later records win."""
+        with open(self.path, "rb") as f:
+            self._data = f.read()
+        data: memoryview = memoryview(self._data)
+        pos: int = 0
+        while pos < len(data):
+            # Feed the member in bounded chunks until its end: handing the decompressor the
+            # rest of the archive would copy it (and again into unused_data) for every record
+            decompressor = zlib.decompressobj(wbits=31)
+            head: bytes = b""
+            end: int = pos
+            while not decompressor.eof and end < len(data):
+                chunk: memoryview = data[end:end + ARCHIVE_INDEX_CHUNK]
+                end += len(chunk)
+                output: bytes = decompressor.decompress(chunk)
+                if b"\r\n\r\n" not in head:
+                    head += output
+            length: int = end - pos - len(decompressor.unused_data)
+            url: Optional[str] = None
+            for line in head.split(b"\r\n\r\n", 1)[0].split(b"\r\n"):
+                if line.startswith(b"WARC-Target-URI:"):
+                    url = line.split(b":", 1)[1].strip().decode("utf-8")
+            if url:
+                self._index[url] = (pos, length)
+            pos += length
+        logger.info(f"Loaded crawl archive {self.path} with {len(self._index)} URLs")
+
+    def replay(self, url: str) -> requests.Response:
+        """Rebuild the recorded response for `url` as a requests.Response."""
+        if url not in self._index:
+            raise _lazy_exception("ArchiveMissError")(f"No archived response for {url}")
+        pos, length = self._index[url]
+        record: bytes = gzip.decompress(self._data[pos:pos + length])
+        _warc_head, block = record.split(b"\r\n\r\n", 1)
+        http_head, body = block.split(b"\r\n\r\n", 1)
+        status_line, *header_lines = http_head.decode("latin-1").split("\r\n")
+        _version, status_code, reason = (status_line.split(" ", 2) + [""])[:3]
+
+        response = requests.Response()
+        response.url = url
+        response.status_code = int(status_code)
+        response.reason = reason
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            response.headers[name.strip()] = value.strip()
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        # Drop the trailing record separator
+        response._content = body[:-4] if body.endswith(b"\r\n\r\n") else body
+        return response
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+_crawl_archive: Optional[CrawlArchive] = None
+
+
+def configure_archive(archive: Optional[CrawlArchive]) -> None:
+    """Install (or remove, with None) the record/replay archive used by fetch_page."""
+    global _crawl_archive
+    _crawl_archive = archive
+
+# ------------------------------------------------------------------------------
+# Page Bodies & Charsets
+# ------------------------------------------------------------------------------
+class Page(NamedTuple):
+    """A fetched body as raw bytes plus the charset it decodes with (a Python codec name)."""
+    url: str
+    content: bytes
+    encoding: str
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    @property
+    def is_utf8(self) -> bool:
+        return self.encoding == "utf-8"
+
+
+Markup = Union[str, Page]
+
+BYTE_ORDER_MARKS: Tuple[Tuple[bytes, str], ...] = (
+    (codecs.BOM_UTF8, "utf-8"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def _codec_name(label: Optional[str]) -> Optional[str]:
+    """Python's name for a charset label ('UTF8' -> 'utf-8'), or None if it isn't a known codec."""
+    if not label:
+        return None
+    try:
+        return codecs.lookup(label).name
+    except LookupError:
+        return None
+
+
+def declared_charset(content: bytes, content_type: Optional[str]) -> Optional[str]:
     """
-    Fetch and process the text of a single episode.
-    Returns dict containing cleaned transcript, story elements, tone, etc.
+    The charset a page declares: a byte-order mark, else the Content-Type charset,
+    else a <meta charset> or http-equiv in the first CHARSET_PRESCAN_BYTES.
+    None when nothing usable is declared.
     """
-    logger.info(f"Processing episode: {episode['title']}")
-    episode_html: str = fetch_page(episode["url"])
-    soup: BeautifulSoup = BeautifulSoup(episode_html, 'html.parser')
+    for bom, name in BYTE_ORDER_MARKS:
+        if content.startswith(bom):
+            return name
+    header = CONTENT_TYPE_CHARSET_REGEX.search(content_type or "")
+    encoding: Optional[str] = _codec_name(header.group(1)) if header else None
+    if encoding is None:
+        meta = META_CHARSET_REGEX.search(content, 0, CHARSET_PRESCAN_BYTES)
+        encoding = _codec_name(meta.group(1).decode("ascii")) if meta else None
+    return encoding
 
-    # Usually transcripts are in 'div.postbody'
-    post_body = soup.find('div', class_='postbody')
-    if not post_body:
-        logger.error(f"Transcript not found for episode: {episode['title']}")
-        transcript_raw: str = ""
-    else:
-        transcript_raw = post_body.get_text(separator=" ", strip=True)
-
-    # Keep the original text (lowercased) for annotation (timestamps, etc.)
-    transcript_for_annotation: str = transcript_raw.lower()
-
-    # Clean transcript for final analysis
-    transcript_clean: str = clean_transcript(transcript_raw)
-    transcript_processed: str = tokenize_and_lemmatize(transcript_clean)
-
-    # Annotate story elements and tone
-    negative_annotations, positive_annotations = annotate_story_elements(transcript_for_annotation)
-    narrative_tone: Dict[str, Any] = analyze_narrative_tone(transcript_clean)
-
-    return {
-        "season": episode["season"],
-        "episode": episode["episode"],
-        "title": episode["title"],
-        "cleaned_transcript": transcript_processed,
-        "negative_story_elements": negative_annotations,
-        "positive_story_elements": positive_annotations,
-        "narrative_tone": narrative_tone
+
+def detect_charset(content: bytes) -> str:
+    """Guess an undeclared charset from the whole body (what requests' Response.text does)."""
+    guess: Optional[str] = requests.compat.chardet.detect(content)["encoding"] if requests.compat.chardet else None
+    return _codec_name(guess) or "utf-8"
+
+
+def page_from_response(url: str, response: requests.Response) -> Page:
+    encoding: Optional[str] = declared_charset(response.content, response.headers.get("Content-Type"))
+    if encoding is None:
+        encoding = detect_charset(response.content)
+        logger.debug(f"No charset declared for {url}; detected {encoding}")
+    return Page(url, response.content, encoding)
+
+# ------------------------------------------------------------------------------
+# HTML Parser Backends
+# ------------------------------------------------------------------------------
+# The handful of elements the page parsers read, as CSS. Backends compile these
+# once; the lxml backend uses hand-written XPath equivalents (no cssselect needed).
+PAGE_SELECTORS: Dict[str, str] = {
+    "show_links": "a.forumtitle",
+    "episode_links": "a.topictitle",
+    "posts": "div.postbody",
+    "post_author": ".author .username, .author .username-coloured",
+    "post_content": "div.content",
+    "links": "a[href]",
+}
+
+# Text inside these elements is not page text (BeautifulSoup's get_text skips it too)
+NON_TEXT_TAGS: Tuple[str, ...] = ("script", "style", "template", "rt", "rp")
+
+# What a targeted parse keeps of each kind of page: top-level tag -> required class
+# (None = any). Everything inside a kept element is kept; the rest is never built.
+TARGETED_ELEMENTS: Dict[str, Dict[str, Optional[str]]] = {
+    "listing": {"a": None},
+    "topic": {"a": None, "div": "postbody"},
+}
+
+
+class ParserBackend:
+    """
+    The little DOM access the page parsers need, on top of one HTML library.
+    text() mirrors BeautifulSoup's get_text(separator, strip=True): every text node
+    stripped, empty ones dropped, the rest joined with the separator.
+    """
+    name: str = ""
+
+    def parse(self, html: Markup, page: Optional[str] = None) -> Any:
+        """
+        Parse a document, given as text or as a fetched Page whose bytes a backend may
+        read directly. `page` ('listing' or 'topic') lets a backend skip what that
+        page type never needs.
+        """
+        raise NotImplementedError
+
+    def select(self, node: Any, selector: str) -> List[Any]:
+        """All matches of PAGE_SELECTORS[selector] under node, in document order."""
+        raise NotImplementedError
+
+    def select_one(self, node: Any, selector: str) -> Any:
+        matches: List[Any] = self.select(node, selector)
+        return matches[0] if matches else None
+
+    def text(self, node: Any, separator: str = "") -> str:
+        raise NotImplementedError
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def next_link(self, doc: Any) -> Optional[str]:
+        """The href of the first <a> whose text is exactly 'Next'."""
+        raise NotImplementedError
+
+
+def _targeted_filter(elements: Dict[str, Optional[str]]) -> Any:
+    """A parse_only filter that builds only the top-level elements listed in `elements`."""
+    def wanted(name: str, attrs: Optional[Dict[str, Any]]) -> bool:
+        if name not in elements:
+            return False
+        classes: Any = (attrs or {}).get("class") or ""
+        return elements[name] is None or elements[name] in (classes.split() if isinstance(classes, str) else classes)
+
+    try:
+        from bs4 import ElementFilter
+    except ImportError:   # beautifulsoup4 < 4.13 calls a name function with (name, attrs)
+        from bs4 import SoupStrainer
+        return SoupStrainer(lambda name, attrs=None: wanted(name, attrs))
+
+    class TargetedFilter(ElementFilter):
+        def allow_tag_creation(self, nsprefix: Optional[str], name: str, attrs: Optional[Dict[str, Any]]) -> bool:
+            return wanted(name, attrs)
+
+        def allow_string_creation(self, string: str) -> bool:
+            return False
+
+    return TargetedFilter()
+
+
+class SoupBackend(ParserBackend):
+    """
+    BeautifulSoup with the pure-Python html.parser (the original behaviour) and
+    soupsieve-compiled selectors. With targeted=True only the elements in
+    TARGETED_ELEMENTS are built (SoupStrainer-style), skipping the forum chrome.
+    """
+    name = "bs4"
+
+    def __init__(self, targeted: bool = False) -> None:
+        import soupsieve
+        from bs4 import BeautifulSoup
+        self._soup: Callable[..., Any] = BeautifulSoup
+        self._selectors: Dict[str, Any] = {key: soupsieve.compile(css) for key, css in PAGE_SELECTORS.items()}
+        self._filters: Dict[str, Any] = (
+            {page: _targeted_filter(elements) for page, elements in TARGETED_ELEMENTS.items()} if targeted else {}
+        )
+        if targeted:
+            self.name = "bs4-targeted"
+
+    def parse(self, html: Markup, page: Optional[str] = None) -> Any:
+        # html.parser only reads str, so bytes would just be decoded by BeautifulSoup instead
+        text: str = html.text if isinstance(html, Page) else html
+        return self._soup(text, "html.parser", parse_only=self._filters.get(page))
+
+    def select(self, node: Any, selector: str) -> List[Any]:
+        return self._selectors[selector].select(node)
+
+    def select_one(self, node: Any, selector: str) -> Any:
+        return self._selectors[selector].select_one(node)
+
+    def text(self, node: Any, separator: str = "") -> str:
+        return node.get_text(separator=separator, strip=True)
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        return node.get(name)
+
+    def next_link(self, doc: Any) -> Optional[str]:
+        next_link = doc.find('a', string='Next')
+        return next_link.get('href') if next_link else None
+
+
+def _class_test(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class LxmlBackend(ParserBackend):
+    """lxml's libxml2 HTML parser with precompiled XPath queries."""
+    name = "lxml"
+
+    XPATHS: Dict[str, str] = {
+        "show_links": f"descendant::a[{_class_test('forumtitle')}]",
+        "episode_links": f"descendant::a[{_class_test('topictitle')}]",
+        "posts": f"descendant::div[{_class_test('postbody')}]",
+        "post_author": (f"descendant::*[{_class_test('author')}]"
+                        f"//*[{_class_test('username')} or {_class_test('username-coloured')}]"),
+        "post_content": f"descendant::div[{_class_test('content')}]",
+        "links": "descendant::a[@href]",
+        "next_link": "(descendant::a[. = 'Next'])[1]",
+        "text": f"descendant::text()[not({' or '.join(f'ancestor::{tag}' for tag in NON_TEXT_TAGS)})]",
     }
 
+    def __init__(self) -> None:
+        import lxml.html
+        from lxml import etree
+        self._html = lxml.html
+        self._etree = etree
+        # Compiled XPath objects are kept per thread
+        self._local: threading.local = threading.local()
+
+    def _xpath(self, key: str) -> Any:
+        compiled: Optional[Dict[str, Any]] = getattr(self._local, "xpaths", None)
+        if compiled is None:
+            compiled = self._local.xpaths = {
+                k: self._etree.XPath(expr, smart_strings=False) for k, expr in self.XPATHS.items()
+            }
+        return compiled[key]
+
+    def _utf8_parser(self) -> Any:
+        parser: Any = getattr(self._local, "utf8_parser", None)
+        if parser is None:
+            parser = self._local.utf8_parser = self._html.HTMLParser(encoding="utf-8")
+        return parser
+
+    def parse(self, html: Markup, page: Optional[str] = None) -> Any:
+        try:
+            # UTF-8 bytes go straight to libxml2; decoding to str first only for it to re-encode
+            if isinstance(html, Page):
+                if html.is_utf8:
+                    return self._html.document_fromstring(html.content, parser=self._utf8_parser())
+                html = html.text
+            return self._html.document_fromstring(html)
+        except self._etree.ParserError:   # empty document
+            return self._html.document_fromstring("<html></html>")
+
+    def select(self, node: Any, selector: str) -> List[Any]:
+        return self._xpath(selector)(node)
+
+    def text(self, node: Any, separator: str = "") -> str:
+        return separator.join(s for s in (t.strip() for t in self._xpath("text")(node)) if s)
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        return node.get(name)
+
+    def next_link(self, doc: Any) -> Optional[str]:
+        links: List[Any] = self._xpath("next_link")(doc)
+        return links[0].get("href") if links else None
+
+
+class SelectolaxBackend(ParserBackend):
+    """selectolax's Lexbor (C, HTML5-conformant) parser and CSS engine."""
+    name = "selectolax"
+
+    def __init__(self) -> None:
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser_class = LexborHTMLParser
+
+    def parse(self, html: Markup, page: Optional[str] = None) -> Any:
+        # Lexbor parses bytes as UTF-8, which saves decoding UTF-8 pages in Python
+        if isinstance(html, Page):
+            html = html.content if html.is_utf8 else html.text
+        doc = self._parser_class(html)
+        doc.strip_tags(list(NON_TEXT_TAGS))
+        return doc
+
+    def select(self, node: Any, selector: str) -> List[Any]:
+        return node.css(PAGE_SELECTORS[selector])
+
+    def select_one(self, node: Any, selector: str) -> Any:
+        return node.css_first(PAGE_SELECTORS[selector])
+
+    def text(self, node: Any, separator: str = "") -> str:
+        # Lexbor keeps whitespace-only nodes as "" when stripping; split them back out
+        pieces: List[str] = node.text(separator="\x00", strip=True).split("\x00")
+        return separator.join(piece for piece in pieces if piece)
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        return node.attributes.get(name)
+
+    def next_link(self, doc: Any) -> Optional[str]:
+        for link in doc.css("a"):
+            if link.text() == "Next":
+                return link.attributes.get("href")
+        return None
+
+
+PARSER_BACKENDS: Dict[str, Callable[[], ParserBackend]] = {
+    "bs4": SoupBackend,
+    "bs4-targeted": lambda: SoupBackend(targeted=True),
+    "lxml": LxmlBackend,
+    "selectolax": SelectolaxBackend,
+}
+_parser: Optional[ParserBackend] = None   # SoupBackend, created on first use
+
+
+def configure_parser(name: str) -> ParserBackend:
+    """Select the HTML parser used for listing and topic pages by name (see PARSER_BACKENDS)."""
+    global _parser
+    _parser = PARSER_BACKENDS[name]()
+    return _parser
+
+
+def get_parser() -> ParserBackend:
+    global _parser
+    if _parser is None:
+        _parser = SoupBackend()
+    return _parser
+
+
+_stream_topics: bool = False
+
+
+def configure_topic_streaming(enabled: bool) -> None:
+    """Parse topic pages while they download (see stream_topic_page) instead of after."""
+    global _stream_topics
+    _stream_topics = enabled
+
 # ------------------------------------------------------------------------------
-# Main Entry Point
+# NLTK Resources
 # ------------------------------------------------------------------------------
-def main() -> None:
-    """Main script function: gather TV show from user, find it, scrape episodes, annotate, save CSV."""
-    tv_show: str = input("Enter TV show name: ").strip().lower()
+# Data packages the analysis needs -> resource path nltk.data.find looks for
+# (punkt_tab is what word_tokenize loads since NLTK 3.8.2, replacing the pickled punkt;
+# only the nltk tokenizer needs it)
+NLTK_RESOURCES: Dict[str, str] = {
+    "punkt_tab": "tokenizers/punkt_tab/english",
+    "stopwords": "corpora/stopwords",
+    "wordnet": "corpora/wordnet",
+}
+# Where each package was found, per Python environment, so later runs only stat those paths
+NLTK_STAMP_FILE: str = os.path.join(os.path.expanduser("~"), ".cache", "tv_transcript", "nltk_resources.json")
 
-    # 1. Gather all shows under 'TV Shows' forum (f=1662)
-    all_shows = scrape_all_tv_show_forums()
+_nltk_download: bool = True
+_nltk_verified: Set[str] = set()   # packages already found this process
+_nltk_lock: threading.Lock = threading.Lock()
 
-    # 2. Match user input
-    matched_forum = None
-    for forum_data in all_shows:
-        if forum_data["title"].lower() == tv_show:
-            matched_forum = forum_data
-            break
 
-    # 3. Error if not found
-    if not matched_forum:
-        logger.error(f"TV show '{tv_show}' not found under 'TV Shows' (f=1662).")
-        return
+def configure_nltk_download(enabled: bool) -> None:
+    """Allow (or forbid, for offline machines) downloading NLTK data that isn't installed."""
+    global _nltk_download
+    _nltk_download = enabled
 
-    # 4. Scrape episodes for that matched show
-    show_url = matched_forum["url"]
-    logger.info(f"Found TV show '{matched_forum['title']}' at URL: {show_url}")
-    episodes: List[Dict[str, Any]] = scrape_episode_links(show_url)
-    logger.info(f"Total episodes found for '{matched_forum['title']}': {len(episodes)}")
 
-    # 5. Process each episode
-    processed_episodes: List[Dict[str, Any]] = []
-    for ep in episodes:
-        processed_episodes.append(process_episode(ep))
+def _nltk_stamp_key() -> str:
+    return f"{sys.prefix}|{os.environ.get('NLTK_DATA', '')}"
 
-    # 6. Write data to CSV
-    csv_columns: List[str] = [
-        "Season", "Episode", "Title", "Cleaned Transcript",
-        "Negative Story Elements", "Positive Story Elements", "Narrative Tone Annotations"
-    ]
-    csv_file: str = "transcript_analysis.csv"
 
-    with open(csv_file, mode='w', newline='', encoding='utf-8') as file:
-        writer = csv.DictWriter(file, fieldnames=csv_columns)
-        writer.writeheader()
-        for ep_data in processed_episodes:
-            writer.writerow({
-                "Season": ep_data["season"],
-                "Episode": ep_data["episode"],
-                "Title": ep_data["title"],
-                "Cleaned Transcript": ep_data["cleaned_transcript"],
-                "Negative Story Elements": json.dumps(ep_data["negative_story_elements"]),
-                "Positive Story Elements": json.dumps(ep_data["positive_story_elements"]),
-                "Narrative Tone Annotations": json.dumps(ep_data["narrative_tone"])
-            })
+def _read_nltk_stamp() -> Dict[str, str]:
+    try:
+        with open(NLTK_STAMP_FILE, "r", encoding="utf-8") as f:
+            return json.load(f).get(_nltk_stamp_key(), {})
+    except (OSError, ValueError):
+        return {}
 
-    logger.info(f"CSV report generated: {csv_file}")
+
+def _write_nltk_stamp(found: Dict[str, str]) -> None:
+    try:
+        with open(NLTK_STAMP_FILE, "r", encoding="utf-8") as f:
+            stamps: Dict[str, Any] = json.load(f)
+    except (OSError, ValueError):
+        stamps = {}
+    stamps[_nltk_stamp_key()] = found
+    try:
+        os.makedirs(os.path.dirname(NLTK_STAMP_FILE), exist_ok=True)
+        tmp_path: str = f"{NLTK_STAMP_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(stamps, f)
+        os.replace(tmp_path, NLTK_STAMP_FILE)
+    except OSError as exc:
+        logger.debug(f"Could not save NLTK stamp {NLTK_STAMP_FILE}: {exc}")
+
+
+def _find_nltk_resource(path: str) -> Optional[str]:
+    import nltk.data
+    try:
+        return str(nltk.data.find(path))
+    except LookupError:
+        return None
+
+
+def _required_nltk_resources() -> List[str]:
+    """The NLTK_RESOURCES packages the configured tokenizer needs: all but punkt_tab unless it is `nltk`."""
+    return [name for name in NLTK_RESOURCES if name != "punkt_tab" or _tokenizer == "nltk"]
+
+
+def ensure_nltk_resources(download: Optional[bool] = None, names: Optional[List[str]] = None) -> None:
+    """
+    Make sure the NLTK data packages `names` (default: _required_nltk_resources()) are
+    installed; each is checked once per process. Offline first: the stamp file is trusted
+    while the paths it records exist, then the local nltk_data directories are searched.
+    Only packages found nowhere are downloaded, unless `download` (default:
+    configure_nltk_download) is off, in which case a LookupError says what to install.
+    """
+    wanted: List[str] = names if names is not None else _required_nltk_resources()
+    with _nltk_lock:
+        if _nltk_verified.issuperset(wanted):
+            return
+        stamp: Dict[str, str] = _read_nltk_stamp()
+        if set(stamp) >= set(wanted) and all(os.path.exists(stamp[name]) for name in wanted):
+            _nltk_verified.update(wanted)
+            return
+
+        found: Dict[str, str] = {}
+        missing: List[str] = []
+        for name in wanted:
+            path: str = NLTK_RESOURCES[name]
+            location: Optional[str] = _find_nltk_resource(path)
+            if location is None and (_nltk_download if download is None else download):
+                import nltk
+                logger.info(f"Downloading NLTK resource '{name}'")
+                if nltk.download(name, quiet=True):
+                    location = _find_nltk_resource(path)
+            if location is None:
+                missing.append(name)
+            else:
+                found[name] = location
+        if missing:
+            raise LookupError(f"Missing NLTK data: {', '.join(missing)}. Install it with "
+                              f"`python -m nltk.downloader {' '.join(missing)}` or set NLTK_DATA.")
+        _write_nltk_stamp({**stamp, **found})   # keep packages another tokenizer's runs recorded
+        _nltk_verified.update(wanted)
+
+
+@lru_cache(maxsize=None)
+def _nltk() -> Any:
+    """The nltk package, imported on first use once its data has been verified."""
+    ensure_nltk_resources()
+    import nltk.corpus
+    import nltk.stem
+    import nltk.tokenize
+    return nltk
+
+
+@lru_cache(maxsize=None)
+def _punkt_tokenize() -> Any:
+    """nltk.tokenize, once punkt_tab has been verified too (the default data set may leave it out)."""
+    ensure_nltk_resources(names=["punkt_tab"])
+    return _nltk().tokenize
+
+
+def word_tokenize(text: str) -> List[str]:
+    """nltk.tokenize.word_tokenize, loading NLTK on first call."""
+    return _punkt_tokenize().word_tokenize(text)
+
+
+# The alphanumeric tokens word_tokenize would produce, found with one regex and no Punkt:
+# a run of letters/digits is a token when the Treebank rules split on both sides of it
+_TREEBANK_PADDED: str = r"""\s;@#$%&?!*()\[\]{}<>"`«»“”‘’„‒-―"""   # always split off
+# What may follow a clitic for it to split off: anything that ends up as a space once padded
+_CLITIC_END: str = rf"(?:[{_TREEBANK_PADDED},:.]|--|'(?:[{_TREEBANK_PADDED},:.]|$)|$)"
+FAST_TOKEN_REGEX: re.Pattern = re.compile(rf"""
+    (?: (?<![^{_TREEBANK_PADDED}])        # start of text, whitespace or a padded mark
+      | (?<=[,:])(?!\d)                   # comma/colon, unless inside a number
+      | (?<=\.\.) | (?<=--)               # ellipsis, double dash
+      | (?<=(?<!\w)')(?!(?i:re|ve|ll|m|t|s|d|n)\b)   # opening quote
+    )
+    (?: ([^\W_]+)(?=n't{_CLITIC_END}|N'T{_CLITIC_END})   # "do" of "don't"
+      | ((?i:d(?='ye\b)|more(?='n\b)))    # "d'ye", "more'n"
+      | (?!\d+\.\s+[a-z])                 # Punkt reads "5. and" as a number, not a sentence end
+        ([^\W_]+)(?=
+            [{_TREEBANK_PADDED}] | $
+          | [,:](?!\d) | \.\. | --
+          | (?<!(?<![^\W_])[^\W\d_])       # nor "a." (an initial)
+            \.[\]\)}}>"'»”’]*(?:\s|$)      # sentence-final period
+          | '(?:[sSmMdD]|ll|LL|re|RE|ve|VE)?(?={_CLITIC_END})   # clitic or closing quote
+          | ''
+        )
+    )
+""", re.VERBOSE)
+# Words the Treebank tokenizer splits in two -> length of the first part
+SPLIT_CONTRACTIONS: Dict[str, int] = {"cannot": 3, "gimme": 3, "gonna": 3, "gotta": 3, "lemme": 3, "wanna": 3}
+
+
+def fast_word_tokenize(text: str) -> List[str]:
+    """
+    The alphanumeric tokens of word_tokenize(text) -- the only ones the analysis keeps --
+    without loading Punkt. Every period followed by whitespace is taken as a sentence end
+    except after an initial or a number. An approximation: it can disagree around Punkt's
+    abbreviations ("mr.?") and contractions glued to other symbols ("gonna/"), about 3%
+    of punctuation-dense fragments (benchmarks.py tokenizer).
+    """
+    tokens: List[str] = []
+    for before_nt, archaic, token in FAST_TOKEN_REGEX.findall(text):
+        token = token or before_nt or archaic
+        split: Optional[int] = SPLIT_CONTRACTIONS.get(token.lower())
+        if split:
+            tokens += (token[:split], token[split:])
+        else:
+            tokens.append(token)
+    return tokens
+
+
+TOKENIZERS: Dict[str, Callable[[str], List[str]]] = {
+    "nltk": word_tokenize,        # reference output
+    "fast": fast_word_tokenize,   # alphanumeric tokens only, 3-10x faster
+}
+_tokenizer: str = "nltk"
+
+
+def configure_tokenizer(name: str) -> None:
+    """Select the tokenizer Analyzers use by name (see TOKENIZERS); the shared Analyzer is rebuilt on next use."""
+    global _tokenizer
+    if name not in TOKENIZERS:
+        raise ValueError(f"Unknown tokenizer {name!r}; choose from {', '.join(TOKENIZERS)}")
+    _tokenizer = name
+    configure_analyzer(None)
+
+# ------------------------------------------------------------------------------
+# Transcript Analyzer
+# ------------------------------------------------------------------------------
+LEMMA_CACHE_SIZE: int = 100_000   # distinct tokens whose lemma an Analyzer remembers
+# A lexicon pattern that is only word-bounded literal alternatives: \bterm\b or \b(a|b c)\b
+LITERAL_PATTERN_REGEX: re.Pattern = re.compile(r'\\b(?:([\w ]+)|\((?:\?:)?([\w ]+(?:\|[\w ]+)*)\))\\b')
+WORD_BOUNDARY_REGEX: re.Pattern = re.compile(r'\b')
+
+
+def _trie_regex(terms: Iterable[str]) -> str:
+    """Alternation of `terms` factored into a prefix trie (longer terms first), so each position costs one trie walk."""
+    trie: Dict[str, Any] = {}
+    for term in terms:
+        node: Dict[str, Any] = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}   # a term ends here
+
+    def build(node: Dict[str, Any]) -> str:
+        branches: List[str] = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body: str = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class LexiconMatcher:
+    """
+    Finds the matches of many lexicon patterns (label -> regex) in one pass over the text.
+    Patterns made of word-bounded literal alternatives (all of NEGATIVE_ELEMENTS and
+    POSITIVE_ELEMENTS) are merged into a single case-insensitive trie regex, tried as
+    a lookahead at every word start so overlapping terms of different labels are all
+    seen. Any other pattern is run on its own. find() returns, per label, exactly the
+    spans re.finditer would give for that label's pattern alone.
+    """
+
+    def __init__(self, lexicon: Dict[Any, str]) -> None:
+        self.labels: List[Any] = list(lexicon)
+        # term -> (label, index of the alternative in the label's pattern)
+        self._term_labels: Dict[str, List[Tuple[Any, int]]] = {}
+        self._fallback: Dict[Any, re.Pattern] = {}
+        for label, pattern in lexicon.items():
+            literal = LITERAL_PATTERN_REGEX.fullmatch(pattern)
+            if literal is None:
+                self._fallback[label] = re.compile(pattern, re.IGNORECASE)
+                continue
+            for alternative, term in enumerate((literal.group(1) or literal.group(2)).split("|")):
+                self._term_labels.setdefault(term.casefold(), []).append((label, alternative))
+        # The trie regex reports the longest term at each start; shorter terms that prefix it are checked here
+        self._prefixes: Dict[str, List[str]] = {
+            term: [term[:i] for i in range(1, len(term)) if term[:i] in self._term_labels]
+            for term in self._term_labels
+        }
+        self._regex: Optional[re.Pattern] = (
+            re.compile(rf'\b(?=({_trie_regex(self._term_labels)})\b)', re.IGNORECASE) if self._term_labels else None
+        )
+
+    def find(self, text: str) -> Dict[Any, List[Tuple[int, int]]]:
+        """(start, end) spans of every label's matches, in text order."""
+        candidates: Dict[Any, List[Tuple[int, int, int]]] = {label: [] for label in self.labels}
+        if self._regex is not None:
+            for match in self._regex.finditer(text):
+                start: int = match.start()
+                found: str = match.group(1)
+                term: Optional[str] = self._term_of(found)
+                if term is None:
+                    continue
+                for label, alternative in self._term_labels[term]:
+                    candidates[label].append((start, alternative, start + len(found)))
+                for prefix in self._prefixes[term]:
+                    if WORD_BOUNDARY_REGEX.match(text, start + len(prefix)):
+                        for label, alternative in self._term_labels[prefix]:
+                            candidates[label].append((start, alternative, start + len(prefix)))
+        for label, regex in self._fallback.items():
+            candidates[label] = [(match.start(), 0, match.end()) for match in regex.finditer(text)]
+
+        # Per label, keep what a regex scan would: leftmost first, the earliest alternative
+        # at a given start, and nothing overlapping the previous match
+        spans: Dict[Any, List[Tuple[int, int]]] = {}
+        for label, found_spans in candidates.items():
+            found_spans.sort()
+            chosen: List[Tuple[int, int]] = []
+            end: int = 0
+            for start, _alternative, stop in found_spans:
+                if start >= end:
+                    chosen.append((start, stop))
+                    end = stop
+            spans[label] = chosen
+        return spans
+
+    def _term_of(self, found: str) -> Optional[str]:
+        """The lexicon term a trie match stands for."""
+        term: str = found.casefold()
+        if term in self._term_labels:
+            return term
+        # re.IGNORECASE pairs a few characters that casefold() maps elsewhere ("İ" matches "i"
+        # but casefolds to "i̇"); it compares code point by code point, so lengths agree
+        for candidate in self._term_labels:
+            if len(candidate) == len(found) and re.fullmatch(re.escape(candidate), found, re.IGNORECASE):
+                return candidate
+        return None
+
+
+class TimestampIndex:
+    """
+    Every TIMESTAMP_REGEX match of a transcript, located once: sorted start/end offsets
+    and the time in seconds. window(start, end) returns exactly what
+    TIMESTAMP_REGEX.findall(text[start:end]) would, with bisect instead of a re-scan.
+
+    That holds because the pattern only consumes characters (no anchors, lookarounds or
+    \\b): a position where the full-text scan found nothing finds nothing in a slice,
+    and a full-text match that fits in the slice is found there unchanged. Only where
+    the slice cuts through a timestamp does the scan differ; those few characters are
+    re-scanned with the regex.
+    """
+
+    def __init__(self, text: str, regex: re.Pattern = TIMESTAMP_REGEX) -> None:
+        self.text: str = text
+        self.regex: re.Pattern = regex
+        matches: List[re.Match] = list(regex.finditer(text))
+        self.starts: List[int] = [match.start() for match in matches]
+        self.ends: List[int] = [match.end() for match in matches]
+        self.seconds: List[int] = [_timestamp_seconds(match.group()) for match in matches]
+
+    def window(self, start: int, end: int) -> List[str]:
+        """Timestamps a regex scan of text[start:end] finds, including ones the cut truncates."""
+        text, starts, ends, regex = self.text, self.starts, self.ends, self.regex
+        start, end = max(0, start), min(end, len(text))
+        found: List[str] = []
+        # Head: while the scan position is inside a timestamp the full-text scan skipped over,
+        # the slice can match differently (e.g. "1:23]" out of "[00:01:23]"), so scan it for real
+        pos: int = start
+        while True:
+            i: int = bisect.bisect_right(starts, pos) - 1
+            if i < 0 or ends[i] <= pos or starts[i] == pos:
+                break
+            match = regex.search(text, pos, end)
+            if match is None:
+                return found
+            if match.start() >= ends[i]:
+                pos = ends[i]
+                break
+            found.append(match.group())
+            pos = match.end()
+        # Middle: in step with the full-text scan, so its matches are the answer...
+        for i in range(bisect.bisect_left(starts, pos), len(starts)):
+            if starts[i] >= end:
+                break
+            if ends[i] > end:
+                # ...until one crosses the end of the window; the scan of the cut-off rest is redone
+                found.extend(match.group() for match in regex.finditer(text, starts[i], end))
+                break
+            found.append(text[starts[i]:ends[i]])
+        return found
+
+
+def _timestamp_seconds(stamp: str) -> int:
+    """Seconds into the episode of a '[hh:mm:ss]' or 'mm:ss' timestamp."""
+    seconds: int = 0
+    for part in stamp.strip("[]").split(":"):
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
+LEMMA_TABLE_MAGIC: bytes = b"TVLEMMA1"
+# magic, a native-order probe (tables are only readable on the byte order that wrote them), entry count
+LEMMA_TABLE_HEADER: struct.Struct = struct.Struct("=8sII")
+_BYTE_ORDER_PROBE: int = 0x01020304
+
+
+class LemmaTable:
+    """
+    Read-only surface form -> lemma table in one memory-mapped file (see build_lemma_table):
+    UTF-8 keys sorted bytewise behind a uint32 offset array and found by binary search, and
+    a parallel offset array into the lemmas, where an empty lemma means "same as the key".
+    Opening a table reads only its header, and every process mapping it shares its pages.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        with open(path, "rb") as f:
+            self._data: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, probe, count = LEMMA_TABLE_HEADER.unpack_from(self._data)
+        if magic != LEMMA_TABLE_MAGIC or probe != _BYTE_ORDER_PROBE:
+            self._data.close()
+            raise ValueError(f"{path} is not a lemma table for this platform; rebuild it with --build-lemma-table")
+        self._count: int = count
+        view: memoryview = memoryview(self._data)
+        offsets_size: int = 4 * (count + 1)
+        self._key_offsets: memoryview = view[LEMMA_TABLE_HEADER.size:][:offsets_size].cast("I")
+        self._lemma_offsets: memoryview = view[LEMMA_TABLE_HEADER.size + offsets_size:][:offsets_size].cast("I")
+        self._keys_start: int = LEMMA_TABLE_HEADER.size + 2 * offsets_size
+        self._lemmas_start: int = self._keys_start + self._key_offsets[count]
+        view.release()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def get(self, word: str) -> Optional[str]:
+        """The lemma stored for `word`, or None if the table doesn't have it."""
+        key: bytes = word.encode("utf-8")
+        data, offsets, keys_start = self._data, self._key_offsets, self._keys_start
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid: int = (lo + hi) // 2
+            probe: bytes = data[keys_start + offsets[mid]:keys_start + offsets[mid + 1]]
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                start, end = self._lemma_offsets[mid], self._lemma_offsets[mid + 1]
+                return data[self._lemmas_start + start:self._lemmas_start + end].decode("utf-8") if end > start else word
+        return None
+
+    def close(self) -> None:
+        self._key_offsets.release()
+        self._lemma_offsets.release()
+        self._data.close()
+
+
+def build_lemma_table(path: str, words: Iterable[str], lemmatize: Callable[[str], str]) -> int:
+    """Write lemmatize(word) for every distinct word to `path` as a LemmaTable; returns the entry count."""
+    keys: List[bytes] = sorted({word.encode("utf-8") for word in words})
+    key_offsets: array = array("I", [0])
+    lemma_offsets: array = array("I", [0])
+    key_blob: bytearray = bytearray()
+    lemma_blob: bytearray = bytearray()
+    for key in keys:
+        key_blob += key
+        key_offsets.append(len(key_blob))
+        word: str = key.decode("utf-8")
+        lemma: str = lemmatize(word)
+        if lemma != word:
+            lemma_blob += lemma.encode("utf-8")
+        lemma_offsets.append(len(lemma_blob))
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Replace rather than rewrite in place: other processes may have the old table mapped
+    tmp_path: str = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(LEMMA_TABLE_HEADER.pack(LEMMA_TABLE_MAGIC, _BYTE_ORDER_PROBE, len(keys)))
+        f.write(key_offsets.tobytes())
+        f.write(lemma_offsets.tobytes())
+        f.write(key_blob)
+        f.write(lemma_blob)
+    os.replace(tmp_path, path)
+    return len(keys)
+
+
+def wordnet_exception_forms() -> Set[str]:
+    """Single-word surface forms from WordNet's exception lists (irregular plurals, verb forms, ...)."""
+    wordnet = _nltk().corpus.wordnet
+    forms: Set[str] = set()
+    for pos in ("noun", "verb", "adj", "adv"):
+        with wordnet.open(f"{pos}.exc") as f:
+            forms.update(line.split(" ", 1)[0] for line in f if line.split(" ", 1)[0].isalnum())
+    return forms
+
+
+def _source_texts(source: str) -> Iterator[str]:
+    """Texts of a lemma table source: each page of a crawl archive, each row of a CSV, or a whole text file."""
+    if source.endswith(".warc.gz"):
+        archive: CrawlArchive = CrawlArchive(source, "replay")
+        for url in archive.urls():
+            yield archive.replay(url).text
+        return
+    csv.field_size_limit(1 << 30)   # a whole transcript per field
+    with open(source, "r", encoding="utf-8", newline="") as f:
+        if source.endswith(".csv"):
+            yield from (" ".join(row) for row in csv.reader(f))
+        else:
+            yield f.read()
+
+
+def build_lemma_table_from_files(path: str, sources: List[str]) -> int:
+    """
+    Build the lemma table at `path` for the vocabulary of `sources` plus WordNet's exception
+    forms, lemmatized by WordNet. Sources should hold raw transcripts -- a --record crawl
+    archive (.warc.gz), or CSV/text files -- cleaned and tokenized as the pipeline does;
+    already-lemmatized text (like the CSV this script writes) lacks the inflected forms.
+    """
+    analyzer: Analyzer = get_analyzer()
+    words: Set[str] = wordnet_exception_forms()
+    for source in sources:
+        for text in _source_texts(source):
+            words.update(token for token in analyzer.tokenize(analyzer.clean(text))
+                         if token.isalnum() and token not in analyzer.stop_words)
+    count: int = build_lemma_table(path, words, analyzer.lemmatizer.lemmatize)
+    logger.info(f"Lemma table {path}: {count} words, {os.path.getsize(path) / 1024:.0f} KB")
+    return count
+
+
+_lemma_table: Optional[str] = None   # path of the LemmaTable new Analyzers consult before WordNet
+
+
+def configure_lemma_table(path: Optional[str]) -> None:
+    """Look lemmas up in the table at `path` first (None = WordNet only); the shared Analyzer is rebuilt on next use."""
+    global _lemma_table
+    if path:
+        LemmaTable(path).close()   # fail now, not in the first worker
+    _lemma_table = path
+    configure_analyzer(None)
+
+
+class EpisodeDocument(NamedTuple):
+    """One transcript in every form the analysis stages read, each computed once (Analyzer.document)."""
+    lowered: str         # raw transcript, lowercased: story elements and timestamps are found here
+    text: str            # cleaned: no tags, timestamps or extra whitespace
+    tokens: List[str]    # Analyzer.tokenize(text), shared by lemmatization and tone analysis
+    lemmas: List[str]    # alphanumeric, non-stopword tokens, lemmatized
+
+
+class Analyzer:
+    """
+    Analysis state built once and reused for every episode: one LexiconMatcher for all
+    story elements, a keyword -> tones index, the stopword set, a WordNet lemmatizer
+    and a bounded LRU cache of lemmas. The module-level analysis functions are thin
+    wrappers over the shared instance from get_analyzer().
+    """
+
+    def __init__(self,
+                 negative_elements: Optional[Dict[str, str]] = None,
+                 positive_elements: Optional[Dict[str, str]] = None,
+                 tone_keywords: Optional[Dict[str, List[str]]] = None,
+                 lemma_cache_size: int = LEMMA_CACHE_SIZE,
+                 tokenizer: Optional[str] = None,
+                 lemma_table: Optional[str] = None) -> None:
+        negative_elements = negative_elements or NEGATIVE_ELEMENTS
+        positive_elements = positive_elements or POSITIVE_ELEMENTS
+        self.negative_elements: List[str] = list(negative_elements)
+        self.positive_elements: List[str] = list(positive_elements)
+        self.story_matcher: LexiconMatcher = LexiconMatcher({
+            **{("negative", element): pattern for element, pattern in negative_elements.items()},
+            **{("positive", element): pattern for element, pattern in positive_elements.items()},
+        })
+        self.tones: List[str] = list(tone_keywords or TONE_KEYWORDS)
+        self.keyword_tones: Dict[str, List[str]] = {}
+        for tone, keywords in (tone_keywords or TONE_KEYWORDS).items():
+            for keyword in keywords:
+                tones: List[str] = self.keyword_tones.setdefault(keyword, [])
+                if tone not in tones:
+                    tones.append(tone)
+        nltk = _nltk()
+        self.stop_words: FrozenSet[str] = frozenset(nltk.corpus.stopwords.words('english'))
+        self.lemmatizer: WordNetLemmatizer = nltk.stem.WordNetLemmatizer()
+        # WordNet loads on the first lemmatize call, so with a table that covers the vocabulary it never does
+        table_path: Optional[str] = lemma_table or _lemma_table
+        self.lemma_table: Optional[LemmaTable] = LemmaTable(table_path) if table_path else None
+        self.lemmatize: Callable[[str], str] = lru_cache(maxsize=lemma_cache_size)(
+            self._table_lemmatize if self.lemma_table else self.lemmatizer.lemmatize
+        )
+        self.tokenizer: str = tokenizer or _tokenizer
+        self.tokenize: Callable[[str], List[str]] = TOKENIZERS[self.tokenizer]
+
+    def warm_up(self) -> None:
+        """Load punkt and WordNet (both lazy in NLTK), or touch the lemma table, now rather than on the first episode."""
+        self.tokenize("warm up")
+        if self.lemma_table is not None:
+            self.lemma_table.get("episodes")   # not self.lemmatize: a miss would load WordNet
+        else:
+            self.lemmatizer.lemmatize("episodes")
+
+    def _table_lemmatize(self, word: str) -> str:
+        lemma: Optional[str] = self.lemma_table.get(word)
+        return self.lemmatizer.lemmatize(word) if lemma is None else lemma
+
+    def clean(self, raw_text: str) -> str:
+        """Convert text to lowercase, remove HTML tags, timestamps, and extra whitespace."""
+        logger.info("Cleaning transcript text")
+        return self._clean_lowered(raw_text.lower())
+
+    def _clean_lowered(self, text: str) -> str:
+        text = HTML_TAG_REGEX.sub('', text)         # remove HTML tags
+        text = TIMESTAMP_REGEX.sub('', text)        # remove timestamps like [00:01:23]
+        text = WHITESPACE_REGEX.sub(' ', text).strip()  # remove extra whitespace
+        logger.debug(f"Cleaned transcript (first 100 chars): {text[:100]}...")
+        return text
+
+    def lemmatize_tokens(self, tokens: List[str]) -> List[str]:
+        """Drop stopwords and non-alphanumeric tokens, and lemmatize the rest."""
+        stop_words: FrozenSet[str] = self.stop_words
+        lemmatize: Callable[[str], str] = self.lemmatize
+        lemmas: List[str] = [lemmatize(token) for token in tokens if token.isalnum() and token not in stop_words]
+        logger.debug(f"Processed tokens (first 20): {lemmas[:20]}")
+        return lemmas
+
+    def tokenize_and_lemmatize(self, text: str) -> str:
+        """Tokenize, remove stopwords/punctuation, and lemmatize the transcript."""
+        logger.info("Tokenizing and lemmatizing transcript")
+        return ' '.join(self.lemmatize_tokens(self.tokenize(text)))
+
+    def lemmatize_batch(self, token_lists: List[List[str]]) -> List[List[str]]:
+        """
+        lemmatize_tokens for several documents at once: tokens are mapped to integer IDs in a
+        vocabulary shared by the batch, each distinct type is lemmatized once, and the lemmas
+        are mapped back through the IDs.
+        """
+        stop_words: FrozenSet[str] = self.stop_words
+        vocabulary: Dict[str, int] = {}
+        id_lists: List[List[int]] = [
+            [vocabulary.setdefault(token, len(vocabulary)) for token in tokens
+             if token.isalnum() and token not in stop_words]
+            for tokens in token_lists
+        ]
+        lemmatize: Callable[[str], str] = self.lemmatize
+        lemmas: List[str] = [lemmatize(token) for token in vocabulary]
+        occurrences: int = sum(map(len, id_lists))
+        logger.info(f"Lemmatized {len(vocabulary)} word types for {occurrences} tokens in {len(token_lists)} "
+                    f"transcripts (type/token ratio {len(vocabulary) / max(occurrences, 1):.3f})")
+        return [[lemmas[i] for i in ids] for ids in id_lists]
+
+    def document(self, transcript_raw: str, lemmatize: bool = True) -> EpisodeDocument:
+        """Lowercase, clean, tokenize and lemmatize a raw transcript, once each (lemmas stay empty without `lemmatize`)."""
+        lowered: str = transcript_raw.lower()
+        logger.info("Cleaning transcript text")
+        text: str = self._clean_lowered(lowered)
+        logger.info("Tokenizing and lemmatizing transcript" if lemmatize else "Tokenizing transcript")
+        tokens: List[str] = self.tokenize(text)
+        return EpisodeDocument(lowered, text, tokens, self.lemmatize_tokens(tokens) if lemmatize else [])
+
+    def annotate_story_elements(self, transcript: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Find occurrences of negative and positive story elements in the transcript text.
+        For negative elements, store counts + timestamps.
+        For positive elements, store counts + up to 3 'checks' with local context.
+        """
+        logger.info("Annotating story elements")
+        negative_annotations: Dict[str, Any] = {}
+        positive_annotations: Dict[str, Any] = {}
+        spans: Dict[Any, List[Tuple[int, int]]] = self.story_matcher.find(transcript)
+        timestamp_index: TimestampIndex = TimestampIndex(transcript)
+
+        # Negative elements
+        for element in self.negative_elements:
+            matches: List[Tuple[int, int]] = spans[("negative", element)]
+            timestamps: List[str] = []
+            for match_start, match_end in matches:
+                ts_matches = timestamp_index.window(match_start - NEARBY_WINDOW, match_end + NEARBY_WINDOW)
+                timestamps.extend(ts_matches)
+                logger.debug(f"Negative element '{element}' found at position {match_start} with timestamps: {ts_matches}")
+            negative_annotations[element] = {"count": len(matches), "timestamps": timestamps}
+
+        # Positive elements
+        for element in self.positive_elements:
+            matches = spans[("positive", element)]
+            checks: List[Dict[str, Any]] = []
+            # Only store up to 3 checks
+            for i, (match_start, match_end) in enumerate(matches[:3]):
+                ts_matches = timestamp_index.window(match_start - NEARBY_WINDOW, match_end + NEARBY_WINDOW)
+                checks.append({"check": f"Check {i+1}", "timestamps": ts_matches})
+                logger.debug(f"Positive element '{element}' found at position {match_start} with timestamps: {ts_matches}")
+            positive_annotations[element] = {"count": len(matches), "checks": checks}
+
+        return negative_annotations, positive_annotations
+
+    def analyze_narrative_tone(self, transcript: str) -> Dict[str, Any]:
+        """
+        Count occurrences of tone keywords in the transcript
+        (e.g., empathetic, resolute, critical, optimistic).
+        """
+        logger.info("Performing narrative tone analysis")
+        return self.count_tones(self.tokenize(transcript.lower()))
+
+    def count_tones(self, tokens: List[str]) -> Dict[str, Any]:
+        """Tone keyword counts over already tokenized (lowercase) text."""
+        tone_counts: Dict[str, int] = {tone: 0 for tone in self.tones}
+        keyword_tones: Dict[str, List[str]] = self.keyword_tones
+        for token in tokens:
+            for tone in keyword_tones.get(token, ()):
+                tone_counts[tone] += 1
+                logger.debug(f"Token '{token}' contributes to tone '{tone}'")
+        return tone_counts
+
+    def analyze(self, episode: Dict[str, Any], transcript_raw: str) -> Dict[str, Any]:
+        """Clean, lemmatize and annotate a raw transcript into the episode's output record."""
+        return self._record(episode, self.document(transcript_raw))
+
+    def analyze_batch(self, items: List[Tuple[Dict[str, Any], str]]) -> List[Dict[str, Any]]:
+        """analyze() for several (episode, raw transcript) pairs, lemmatizing their shared vocabulary once."""
+        docs: List[EpisodeDocument] = [self.document(transcript_raw, lemmatize=False) for _, transcript_raw in items]
+        lemma_lists: List[List[str]] = self.lemmatize_batch([doc.tokens for doc in docs])
+        return [self._record(episode, doc._replace(lemmas=lemmas))
+                for (episode, _), doc, lemmas in zip(items, docs, lemma_lists)]
+
+    def _record(self, episode: Dict[str, Any], doc: EpisodeDocument) -> Dict[str, Any]:
+        # Story elements are found in the lowercased original (timestamps intact),
+        # tone in the tokens of the cleaned text
+        negative_annotations, positive_annotations = self.annotate_story_elements(doc.lowered)
+        logger.info("Performing narrative tone analysis")
+        narrative_tone: Dict[str, Any] = self.count_tones(doc.tokens)
+
+        return {
+            "season": episode["season"],
+            "episode": episode["episode"],
+            "title": episode["title"],
+            "cleaned_transcript": ' '.join(doc.lemmas),
+            "negative_story_elements": negative_annotations,
+            "positive_story_elements": positive_annotations,
+            "narrative_tone": narrative_tone
+        }
+
+
+_analyzer: Optional[Analyzer] = None   # created on first use
+_analyzer_lock: threading.Lock = threading.Lock()
+
+
+def configure_analyzer(analyzer: Optional[Analyzer]) -> None:
+    """Install the Analyzer the module-level analysis functions use, warmed up (None = a default one on next use)."""
+    global _analyzer
+    with _analyzer_lock:
+        if analyzer is not None:
+            analyzer.warm_up()
+        _analyzer = analyzer
+
+
+def get_analyzer() -> Analyzer:
+    """
+    Return the shared Analyzer; with --concurrency, executor threads share one instead of each
+    building their own. It is warmed up under the lock, since NLTK's lazy corpus loaders take
+    none and every thread's first lemmatize would otherwise load WordNet at once.
+    """
+    global _analyzer
+    with _analyzer_lock:
+        if _analyzer is None:
+            analyzer: Analyzer = Analyzer()
+            analyzer.warm_up()
+            _analyzer = analyzer
+        return _analyzer
+
+# ------------------------------------------------------------------------------
+# Utility Functions
+# ------------------------------------------------------------------------------
+def set_base_url(base_url: str) -> None:
+    """Point the scraper at another ForeverDreaming-compatible board (e.g. mock_forum_server.py)."""
+    global BASE_URL, TV_SHOWS_URL
+    BASE_URL = base_url.rstrip("/")
+    TV_SHOWS_URL = urljoin(BASE_URL, "/viewforum.php?f=1662")
+
+
+def _http_get(url: str, headers: Optional[Dict[str, str]] = None,
+              read_timeout: Optional[float] = None, stream: bool = False) -> requests.Response:
+    """
+    GET `url` over the shared session, recording whether the connection was reused.
+    With stream=True only the headers have been read when this returns.
+    """
+    limiter: Optional[HostRateLimiter] = _rate_limiter
+    host: str = urlsplit(url).netloc
+    if limiter:
+        limiter.acquire(host)
+    started: float = time.monotonic()
+    _connect_events.count = 0
+    try:
+        response = get_session().get(
+            url, headers=headers, stream=stream,
+            timeout=(_session_config.connect_timeout, read_timeout or _session_config.read_timeout),
+        )
+    except requests.RequestException:
+        if limiter:
+            limiter.release(host, None, time.monotonic() - started)
+        raise
+    if limiter:
+        limiter.release(host, response.status_code, time.monotonic() - started, _retry_after_seconds(response))
+    reused: bool = _connect_events.count == 0
+    connection_stats.record(host, reused)
+    logger.debug(f"{'Reused' if reused else 'Opened new'} connection for {url}")
+    return response
+
+
+def _http_get_with_retries(url: str, headers: Optional[Dict[str, str]] = None,
+                           stream: bool = False) -> requests.Response:
+    """
+    GET `url`, retrying connection errors, timeouts and retryable statuses with
+    full-jitter exponential backoff until the policy's attempts or deadline run out.
+    A final retryable status is returned (for raise_for_status); a final
+    connection error is re-raised.
+    """
+    policy: RetryPolicy = _retry_policy
+    breaker: CircuitBreaker = _circuit_breaker
+    host: str = urlsplit(url).netloc
+    deadline: float = time.monotonic() + policy.deadline
+    attempt: int = 0
+
+    while True:
+        attempt += 1
+        breaker.wait_until_closed(host, deadline)
+        remaining: float = deadline - time.monotonic()
+        response: Optional[requests.Response] = None
+        try:
+            response = _http_get(url, headers, read_timeout=max(0.1, min(_session_config.read_timeout, remaining)),
+                                 stream=stream)
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            error: str = str(exc)
+        else:
+            if response.status_code not in policy.retry_statuses:
+                breaker.record_success(host)
+                return response
+            error = f"HTTP {response.status_code}"
+        breaker.record_failure(host)
+
+        delay: float = random.uniform(0, min(policy.max_delay, policy.base_delay * 2 ** (attempt - 1)))
+        if response is not None:
+            delay = max(delay, _retry_after_seconds(response) or 0.0)
+        if attempt >= policy.max_attempts or time.monotonic() + delay >= deadline:
+            logger.error(f"Giving up on {url} after {attempt} attempts ({error})")
+            if response is not None:
+                return response
+            raise requests.ConnectionError(f"{url}: {error}")
+        logger.warning(f"Attempt {attempt} for {url} failed ({error}); retrying in {delay:.1f}s")
+        if response is not None:
+            response.close()   # hand a streamed connection back to the pool
+        time.sleep(delay)
+
+
+def _cached_page(url: str, entry: Dict[str, Any], archive: Optional[CrawlArchive]) -> Page:
+    """Wrap a cached body, recording it as a plain 200 response when archiving."""
+    if archive:
+        headers: Dict[str, str] = {"Content-Type": f"text/html; charset={entry['encoding']}"}
+        archive.record(url, 200, "OK", headers, entry["body"])
+    return Page(url, entry["body"], _codec_name(entry["encoding"]) or "utf-8")
+
+
+def fetch_document(url: str) -> Page:
+    """
+    Retrieve the raw body of a given URL and the charset it declares (detected only
+    when it declares none), without decoding it.
+    In replay mode the response comes from the crawl archive; otherwise the HTTP
+    cache (if configured) is consulted first and, when recording, every page
+    returned is appended to the archive.
+    """
+    logger.info(f"Fetching URL: {url}")
+    archive: Optional[CrawlArchive] = _crawl_archive
+    if archive and archive.replaying:
+        response = archive.replay(url)
+        response.raise_for_status()
+        return page_from_response(url, response)
+
+    cache: Optional[HttpCache] = _http_cache
+    entry: Optional[Dict[str, Any]] = cache.lookup(url) if cache else None
+    if cache and entry and cache.is_fresh(entry):
+        cache.record("hits", len(entry["body"]))
+        logger.debug(f"Cache hit for {url}")
+        return _cached_page(url, entry, archive)
+
+    response = _http_get_with_retries(url, cache.conditional_headers(entry) if cache and entry else None)
+    if cache and entry and response.status_code == 304:
+        cache.refresh(url, entry)
+        cache.record("revalidated", len(entry["body"]))
+        logger.debug(f"Cache revalidated for {url}")
+        return _cached_page(url, entry, archive)
+    if archive:
+        archive.record(url, response.status_code, response.reason, dict(response.headers), response.content)
+    response.raise_for_status()
+
+    page: Page = page_from_response(url, response)
+    if cache:
+        cache.record("misses")
+        cache.store(url, page.content, page.encoding, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    logger.debug(f"Fetched {len(page.content)} bytes ({page.encoding}) from {url}")
+    return page
+
+
+def fetch_page(url: str) -> str:
+    """Retrieve the HTML content of a given URL as text (see fetch_document)."""
+    return fetch_document(url).text
+
+
+def extract_season_episode(title: str) -> Tuple[Optional[str], Optional[str]]:
+    """Extract 'SxxExx' pattern from the episode title (if present)."""
+    match = EPISODE_REGEX.search(title)
+    if match:
+        season, episode = match.groups()
+        logger.debug(f"Extracted season: {season}, episode: {episode} from title: {title}")
+        return season, episode
+    logger.debug(f"No season/episode info found in title: {title}")
+    return None, None
+
+
+def clean_transcript(raw_text: str) -> str:
+    """Convert text to lowercase, remove HTML tags, timestamps, and extra whitespace."""
+    return get_analyzer().clean(raw_text)
+
+
+def tokenize_and_lemmatize(text: str) -> str:
+    """Tokenize, remove stopwords/punctuation, and lemmatize the transcript."""
+    return get_analyzer().tokenize_and_lemmatize(text)
+
+
+def annotate_story_elements(transcript: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Find occurrences of negative and positive story elements in the transcript text.
+    For negative elements, store counts + timestamps.
+    For positive elements, store counts + up to 3 'checks' with local context.
+    """
+    return get_analyzer().annotate_story_elements(transcript)
+
+
+def analyze_narrative_tone(transcript: str) -> Dict[str, Any]:
+    """
+    Count occurrences of tone keywords in the transcript
+    (e.g., empathetic, resolute, critical, optimistic).
+    """
+    return get_analyzer().analyze_narrative_tone(transcript)
+
+# ------------------------------------------------------------------------------
+# Scraping Functions
+# ------------------------------------------------------------------------------
+class ListingPage(NamedTuple):
+    """Items parsed from one listing page plus what it says about the other pages."""
+    items: List[Dict[str, Any]]
+    next_url: Optional[str]
+    page_urls: Optional[List[str]]   # all later pages, when the page count is known
+
+
+def _next_page_url(parser: ParserBackend, doc: Any) -> Optional[str]:
+    """Return the absolute URL of the 'Next' pagination link, if present."""
+    href: Optional[str] = parser.next_link(doc)
+    if href:
+        return urljoin(BASE_URL, href)
+    return None
+
+
+def _same_listing(url: str, page_url: str) -> bool:
+    """
+    True if `url` points into the listing or topic at `page_url`: same path and every
+    query parameter of `page_url` (phpBB may add others such as f=), ignoring start= and sid=.
+    """
+    parts, page_parts = urlsplit(url), urlsplit(page_url)
+    params = set((k, v) for k, v in parse_qsl(parts.query) if k not in ("start", "sid"))
+    page_params = set((k, v) for k, v in parse_qsl(page_parts.query) if k not in ("start", "sid"))
+    return parts.path == page_parts.path and page_params <= params
+
+
+def _offset_links(parser: ParserBackend, doc: Any) -> Iterator[Tuple[str, str]]:
+    """(href, label) of every link carrying a start=N offset, in document order."""
+    for a_tag in parser.select(doc, "links"):
+        href: str = parser.attr(a_tag, 'href') or ''
+        if START_OFFSET_REGEX.search(href):
+            yield href, parser.text(a_tag)
+
+
+def _offset_page_urls(links: Iterable[Tuple[str, str]], page_url: str) -> Optional[List[str]]:
+    """
+    Build the start=N URLs of every page after the first from phpBB's numbered
+    pagination links: the smallest offset is the page size and the largest is
+    the last page. Returns None when the page count can't be determined.
+    """
+    if START_OFFSET_REGEX.search(page_url):
+        return None
+    offsets: Dict[int, Tuple[str, str]] = {}
+    for href, label in links:
+        url: str = urljoin(BASE_URL, href)
+        if _same_listing(url, page_url):
+            offsets[int(START_OFFSET_REGEX.search(url).group(2))] = (url, label)
+    positive: List[int] = [offset for offset in offsets if offset > 0]
+    if not positive:
+        return None
+    step, last = min(positive), max(positive)
+    template, label = offsets[last]
+    # A lone 'Next' link says nothing about how many pages follow
+    if last % step or not label.isdigit():
+        return None
+    return [
+        START_OFFSET_REGEX.sub(lambda m: f"{m.group(1)}{offset}", template, count=1)
+        for offset in range(step, last + step, step)
+    ]
+
+
+def _parse_show_listing(html: Markup, page_url: str) -> ListingPage:
+    """Extract show sub-forum links and pagination from a 'TV Shows' listing page."""
+    parser: ParserBackend = get_parser()
+    doc: Any = parser.parse(html, "listing")
+    shows: List[Dict[str, str]] = []
+
+    # Each subforum for a show is typically a link with class 'forumtitle'
+    # or 'forumtitle notranslate'. We'll check both.
+    forum_links = parser.select(doc, "show_links")
+    for fl in forum_links:
+        title = parser.text(fl)
+        href = parser.attr(fl, 'href') or ''
+        full_url = urljoin(BASE_URL, href)
+        shows.append({"title": title, "url": full_url})
+        logger.debug(f"TV show found: {title} -> {full_url}")
+
+    return ListingPage(shows, _next_page_url(parser, doc), _offset_page_urls(_offset_links(parser, doc), page_url))
+
+
+def _parse_episode_listing(page_html: Markup, page_url: str) -> ListingPage:
+    """Extract episode topic links and pagination from a show forum page."""
+    parser: ParserBackend = get_parser()
+    doc: Any = parser.parse(page_html, "listing")
+    episodes: List[Dict[str, Any]] = []
+
+    # Each episode is identified by <a class="topictitle">
+    for a_tag in parser.select(doc, "episode_links"):
+        title: str = parser.text(a_tag)
+        href: str = parser.attr(a_tag, 'href') or ''
+        episode_url: str = urljoin(BASE_URL, href)
+        season, episode = extract_season_episode(title)
+        episodes.append({
+            "title": title,
+            "season": season if season else "",
+            "episode": episode if episode else "",
+            "url": episode_url
+        })
+        logger.debug(f"Found episode: {title} (Season: {season}, Episode: {episode}) at {episode_url}")
+
+    return ListingPage(episodes, _next_page_url(parser, doc), _offset_page_urls(_offset_links(parser, doc), page_url))
+
+
+def _crawl_listing(first_url: str, parse: Callable[[Markup, str], ListingPage],
+                   load_page: Optional[Callable[[str], ListingPage]] = None) -> List[Dict[str, Any]]:
+    """
+    Collect the items of every page of a listing. When the first page reveals the
+    page count, the remaining start=N pages are fetched concurrently (in order);
+    otherwise 'Next' links are followed one page at a time. `load_page` replaces
+    fetch_page + parse for pages that are fetched and parsed in one go.
+    """
+    load: Callable[[str], ListingPage] = load_page or (lambda url: parse(fetch_document(url), url))
+    page: ListingPage = load(first_url)
+    items: List[Dict[str, Any]] = list(page.items)
+    if page.page_urls is not None:
+        logger.info(f"Fetching {len(page.page_urls)} more pages of {first_url} concurrently")
+        with ThreadPoolExecutor(max_workers=PAGINATION_CONCURRENCY, thread_name_prefix="pages") as pool:
+            for other in pool.map(load, page.page_urls):
+                items.extend(other.items)
+        return items
+
+    next_page_url: Optional[str] = page.next_url
+    while next_page_url:
+        logger.info(f"Found next page: {next_page_url}")
+        page = load(next_page_url)
+        items.extend(page.items)
+        next_page_url = page.next_url
+    return items
+
+
+def _iter_listing(first_url: str, parse: Callable[[Markup, str], ListingPage]) -> Iterator[Dict[str, Any]]:
+    """Lazily yield a listing's items, fetching each page only when the previous one is used up."""
+    page: ListingPage = parse(fetch_document(first_url), first_url)
+    yield from page.items
+    if page.page_urls is not None:
+        for url in page.page_urls:
+            yield from parse(fetch_document(url), url).items
+        return
+
+    next_page_url: Optional[str] = page.next_url
+    while next_page_url:
+        page = parse(fetch_document(next_page_url), next_page_url)
+        yield from page.items
+        next_page_url = page.next_url
+
+
+def _parse_topic_page(html: Markup, page_url: str) -> ListingPage:
+    """Extract every post (author, full text and body text) and the pagination of one page of a topic."""
+    parser: ParserBackend = get_parser()
+    doc: Any = parser.parse(html, "topic")
+    posts: List[Dict[str, Any]] = []
+
+    # Usually transcripts are in 'div.postbody'
+    for post_body in parser.select(doc, "posts"):
+        author = parser.select_one(post_body, "post_author")
+        content = parser.select_one(post_body, "post_content")
+        text: str = parser.text(post_body, " ")
+        posts.append({
+            "author": parser.text(author) if author is not None else None,
+            "text": text,
+            # Body without the "Re: ..." subject and byline, for continuation posts
+            "content": parser.text(content, " ") if content is not None else text,
+        })
+
+    return ListingPage(posts, _next_page_url(parser, doc), _offset_page_urls(_offset_links(parser, doc), page_url))
+
+
+# Tags BeautifulSoup's html.parser tree builder closes as soon as they open
+VOID_TAGS: frozenset = frozenset((
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem", "meta",
+    "param", "source", "track", "wbr", "basefont", "bgsound", "command", "frame", "image", "isindex",
+    "nextid", "spacer",
+))
+
+
+class _OpenElement:
+    """Stack entry of TopicStreamParser: what an open element feeds and its BeautifulSoup .string so far."""
+    __slots__ = ("name", "href", "order", "collectors", "posts", "skip", "author_scope", "children", "string")
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.href: Optional[str] = None
+        self.order: int = 0
+        self.collectors: int = 0      # text collectors this element opened
+        self.posts: int = 0           # posts this element opened
+        self.skip: bool = False
+        self.author_scope: bool = False
+        self.children: int = 0
+        self.string: Optional[str] = None
+
+
+class TopicStreamParser(HTMLParser):
+    """
+    Incremental version of _parse_topic_page for the BeautifulSoup backend: feed it
+    chunks of a topic page as they arrive and it keeps only the open-element stack
+    and the text extracted so far, never the whole document or a DOM. It follows
+    BeautifulSoup's html.parser tree rules (end tags close the nearest open
+    element of that name, void tags never open) so the posts, 'Next' link and
+    pagination links come out the same.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self.posts: List[Dict[str, Any]] = []
+        self.links: List[Tuple[str, str]] = []   # (href, label) of start=N links
+        self._next: Optional[Tuple[int, Optional[str]]] = None
+        self._stack: List[_OpenElement] = []
+        self._active: List[List[str]] = []      # text collectors of the open elements
+        self._open_posts: List[Dict[str, Any]] = []
+        self._pending: List[str] = []
+        self._skip_depth: int = 0
+        self._author_depth: int = 0
+        self._anchors: int = 0
+
+    # -- text -------------------------------------------------------------------
+    def handle_data(self, data: str) -> None:
+        self._pending.append(data)
+
+    def handle_entityref(self, name: str) -> None:
+        # Unknown entities stay literal, without the ';', as BeautifulSoup leaves them
+        self._pending.append(HTML5_ENTITIES.get(name + ";", "&" + name))
+
+    def handle_charref(self, name: str) -> None:
+        self._pending.append(html_unescape(f"&#{name};"))
+
+    def _flush(self) -> None:
+        """End the current text node (BeautifulSoup's endData)."""
+        if not self._pending:
+            return
+        text: str = "".join(self._pending)
+        self._pending = []
+        if self._stack:
+            self._stack[-1].children += 1
+            self._stack[-1].string = text
+        if self._skip_depth == 0:
+            stripped: str = text.strip()
+            if stripped:
+                for collector in self._active:
+                    collector.append(stripped)
+
+    def _other_node(self, text: Optional[str] = None) -> None:
+        self._flush()
+        if self._stack:
+            self._stack[-1].children += 1
+            self._stack[-1].string = text
+
+    def handle_comment(self, data: str) -> None:
+        self._other_node(data)
+
+    def handle_decl(self, decl: str) -> None:
+        self._other_node(decl)
+
+    def handle_pi(self, data: str) -> None:
+        self._other_node(data)
+
+    def unknown_decl(self, data: str) -> None:
+        self._other_node(data)
+
+    # -- elements ---------------------------------------------------------------
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._flush()
+        if self._stack:
+            self._stack[-1].children += 1
+            self._stack[-1].string = None
+        attributes: Dict[str, str] = {name: value or "" for name, value in attrs}
+        classes: List[str] = attributes.get("class", "").split()
+        element: _OpenElement = _OpenElement(tag)
+
+        if "username" in classes or "username-coloured" in classes:
+            if self._author_depth:
+                for post in self._open_posts:
+                    if post["author"] is None:
+                        post["author"] = self._collect(element)
+        if tag == "div" and "content" in classes:
+            for post in self._open_posts:
+                if post["content"] is None:
+                    post["content"] = self._collect(element)
+        if tag == "div" and "postbody" in classes:
+            post: Dict[str, Any] = {"author": None, "text": self._collect(element), "content": None}
+            self.posts.append(post)
+            self._open_posts.append(post)
+            element.posts = 1
+        if tag == "a":
+            self._anchors += 1
+            element.order = self._anchors
+            element.href = attributes.get("href")
+            if element.href is not None and START_OFFSET_REGEX.search(element.href):
+                self.links.append((element.href, self._collect(element)))
+        if "author" in classes:
+            element.author_scope = True
+            self._author_depth += 1
+        if tag in NON_TEXT_TAGS:
+            element.skip = True
+            self._skip_depth += 1
+
+        self._stack.append(element)
+        if tag in VOID_TAGS:
+            self._pop()
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        self._flush()
+        for depth in range(len(self._stack) - 1, -1, -1):
+            if self._stack[depth].name == tag:
+                while len(self._stack) > depth:
+                    self._pop()
+                return
+
+    def _collect(self, element: _OpenElement) -> List[str]:
+        collector: List[str] = []
+        self._active.append(collector)
+        element.collectors += 1
+        return collector
+
+    def _pop(self) -> None:
+        element: _OpenElement = self._stack.pop()
+        if element.collectors:
+            del self._active[-element.collectors:]
+        if element.posts:
+            self._open_posts.pop()
+        if element.author_scope:
+            self._author_depth -= 1
+        if element.skip:
+            self._skip_depth -= 1
+        string: Optional[str] = element.string if element.children == 1 else None
+        if element.name == "a" and string == "Next" and (self._next is None or element.order < self._next[0]):
+            self._next = (element.order, element.href)
+        if self._stack:
+            self._stack[-1].string = string
+
+    def close(self) -> None:
+        super().close()
+        self._flush()
+        while self._stack:
+            self._pop()
+
+    def page(self, page_url: str) -> ListingPage:
+        """The ListingPage _parse_topic_page would return for the document fed so far."""
+        posts: List[Dict[str, Any]] = []
+        for post in self.posts:
+            text: str = " ".join(post["text"])
+            posts.append({
+                "author": "".join(post["author"]) if post["author"] is not None else None,
+                "text": text,
+                "content": " ".join(post["content"]) if post["content"] is not None else text,
+            })
+        next_href: Optional[str] = self._next[1] if self._next else None
+        next_url: Optional[str] = urljoin(BASE_URL, next_href) if next_href else None
+        links: List[Tuple[str, str]] = [(href, "".join(label)) for href, label in self.links]
+        return ListingPage(posts, next_url, _offset_page_urls(links, page_url))
+
+
+def stream_topic_page(url: str) -> ListingPage:
+    """
+    Fetch one topic page and parse it while the body downloads, so the HTML is
+    never held in full. A page that declares no charset is read whole so it can
+    be detected, and one whose stream breaks off is fetched again in full.
+    """
+    logger.info(f"Streaming URL: {url}")
+    with _http_get_with_retries(url, stream=True) as response:
+        response.raise_for_status()
+        parser: TopicStreamParser = TopicStreamParser()
+        try:
+            chunks: Iterator[bytes] = response.iter_content(STREAM_CHUNK_SIZE)
+            # The charset must be known before decoding starts: read up to the <meta> prescan window
+            head: bytes = b""
+            for chunk in chunks:
+                head += chunk
+                if len(head) >= CHARSET_PRESCAN_BYTES:
+                    break
+            encoding: Optional[str] = declared_charset(head, response.headers.get("Content-Type"))
+            if encoding is None:
+                content: bytes = head + b"".join(chunks)
+                return _parse_topic_page(Page(url, content, detect_charset(content)), url)
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+            for chunk in chain((head,), chunks):
+                parser.feed(decoder.decode(chunk))
+            parser.feed(decoder.decode(b"", final=True))
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as exc:
+            logger.warning(f"Stream of {url} broke off ({exc}); fetching it in full")
+            return _parse_topic_page(fetch_document(url), url)
+    parser.close()
+    return parser.page(url)
+
+
+def load_topic_page(url: str) -> ListingPage:
+    """Fetch and parse one topic page, streaming it when enabled and nothing needs the full body."""
+    if _stream_topics and _http_cache is None and _crawl_archive is None:
+        return stream_topic_page(url)
+    return _parse_topic_page(fetch_document(url), url)
+
+
+def stitch_transcript(episode: Dict[str, Any], posts: List[Dict[str, Any]]) -> str:
+    """
+    Join a topic's transcript posts in post order: the first post plus any later
+    posts by the same author, since long transcripts continue in follow-up posts.
+    Replies from other members are left out.
+    """
+    if not posts:
+        logger.error(f"Transcript not found for episode: {episode['title']}")
+        return ""
+    author: Optional[str] = posts[0]["author"]
+    parts: List[str] = [posts[0]["text"]]
+    if author is not None:
+        parts.extend(post["content"] for post in posts[1:] if post["author"] == author)
+    if len(parts) > 1:
+        logger.debug(f"Stitched {len(parts)} posts for episode: {episode['title']}")
+    return " ".join(parts)
+
+
+def extract_transcript(episode: Dict[str, Any], episode_html: str) -> str:
+    """Return the raw transcript text of a single topic page ('' if missing)."""
+    return stitch_transcript(episode, _parse_topic_page(episode_html, episode["url"]).items)
+
+
+def fetch_transcript(episode: Dict[str, Any]) -> str:
+    """Fetch every page of an episode's topic (later pages concurrently) and stitch the transcript."""
+    return stitch_transcript(episode, _crawl_listing(episode["url"], _parse_topic_page, load_topic_page))
+
+
+def analyze_transcript(episode: Dict[str, Any], transcript_raw: str) -> Dict[str, Any]:
+    """Clean, lemmatize and annotate a raw transcript into the episode's output record."""
+    return get_analyzer().analyze(episode, transcript_raw)
+
+
+def analyze_transcripts(items: List[Tuple[Dict[str, Any], str]]) -> List[Dict[str, Any]]:
+    """analyze_transcript for a batch of (episode, raw transcript) pairs, lemmatizing each distinct word once."""
+    return get_analyzer().analyze_batch(items)
+
+
+def scrape_all_tv_show_forums() -> List[Dict[str, str]]:
+    """
+    Start from the 'TV Shows' forum (f=1662) and gather links to specific TV shows.
+    Pages after the first are fetched concurrently via start= offsets when the page
+    count is known, otherwise by following the 'Next' link.
+    Returns a list of dicts: {title, url}.
+    """
+    logger.info("Scraping from the 'TV Shows' forum (f=1662).")
+    all_shows: List[Dict[str, str]] = _crawl_listing(TV_SHOWS_URL, _parse_show_listing)
+    logger.info(f"Total sub-forums (TV shows) found: {len(all_shows)}")
+    return all_shows
+
+
+def iter_tv_show_forums() -> Iterator[Dict[str, str]]:
+    """Lazy counterpart of scrape_all_tv_show_forums: yields shows one listing page at a time."""
+    logger.info("Streaming shows from the 'TV Shows' forum (f=1662).")
+    return _iter_listing(TV_SHOWS_URL, _parse_show_listing)
+
+
+def find_tv_show(tv_show: str, seen: Optional[List[Dict[str, str]]] = None,
+                 shows: Optional[Iterator[Dict[str, str]]] = None) -> Optional[Dict[str, str]]:
+    """
+    Stream the 'TV Shows' listing and return the first show whose title matches
+    `tv_show` case-insensitively, fetching no pages beyond the one it is on.
+    Every show examined is appended to `seen`, if given. Pass `shows` (an
+    iter_tv_show_forums() stream) to resume it for the rest of the listing afterwards.
+    """
+    wanted: str = tv_show.lower()
+    for show in shows if shows is not None else iter_tv_show_forums():
+        if seen is not None:
+            seen.append(show)
+        if show["title"].lower() == wanted:
+            return show
+    return None
+
+
+def scrape_episode_links(show_url: str) -> List[Dict[str, Any]]:
+    """
+    Given the forum URL for a specific show, scrape all episode links,
+    fetching the show forum's other pages concurrently (or via 'Next' links).
+    """
+    logger.info(f"Scraping episode links from: {show_url}")
+    return _crawl_listing(show_url, _parse_episode_listing)
+
+
+def process_episode(episode: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fetch and process the text of a single episode.
+    Returns dict containing cleaned transcript, story elements, tone, etc.
+    """
+    logger.info(f"Processing episode: {episode['title']}")
+    return analyze_transcript(episode, fetch_transcript(episode))
+
+# ------------------------------------------------------------------------------
+# Analysis Worker Pool
+# ------------------------------------------------------------------------------
+ANALYSIS_CHUNK_SIZE: int = 4   # episodes sent to a worker process per task
+
+
+def _init_analysis_worker(log_level: int, tokenizer: str, lemma_table: Optional[str]) -> None:
+    """Worker initializer: load stopwords, punkt and WordNet (or map the lemma table) once instead of on the first episode."""
+    logging.getLogger().setLevel(log_level)
+    configure_tokenizer(tokenizer)
+    configure_lemma_table(lemma_table)
+    ensure_nltk_resources(download=False)   # the parent already fetched anything missing
+    get_analyzer().warm_up()
+
+
+def _analyze_chunk(chunk: List[Tuple[Dict[str, Any], str]]) -> List[Dict[str, Any]]:
+    """Worker task: analyze a chunk of (episode, stitched transcript) pairs."""
+    return analyze_transcripts(chunk)
+
+
+class AnalysisPool:
+    """
+    Runs analyze_transcript in worker processes, so cleaning, lemmatization and
+    annotation use every core instead of contending for one GIL. Transcripts are
+    queued as they are fetched and shipped in chunks of `chunk_size`; results()
+    returns the output records in submission order.
+    """
+
+    def __init__(self, workers: int = 0, chunk_size: int = ANALYSIS_CHUNK_SIZE) -> None:
+        self.workers: int = workers or os.cpu_count() or 1
+        self.chunk_size: int = max(1, chunk_size)
+        from concurrent.futures import ProcessPoolExecutor
+        ensure_nltk_resources()
+        self._executor = ProcessPoolExecutor(
+            self.workers, initializer=_init_analysis_worker, initargs=(logging.getLogger().level, _tokenizer, _lemma_table)
+        )
+        self._pending: List[Tuple[Dict[str, Any], str]] = []
+        self._futures: List[Future] = []
+        self._submitted: int = 0
+        # Start the workers now, before the fetch stage has threads running that a fork would copy mid-lock
+        self._executor.submit(os.getpid).result()
+        logger.info(f"Analysis pool started with {self.workers} worker processes")
+
+    def submit(self, episode: Dict[str, Any], transcript: str) -> int:
+        """Queue a transcript for analysis; returns its index in results()."""
+        self._pending.append((episode, transcript))
+        if len(self._pending) >= self.chunk_size:
+            self._flush()
+        self._submitted += 1
+        return self._submitted - 1
+
+    def _flush(self) -> None:
+        if self._pending:
+            self._futures.append(self._executor.submit(_analyze_chunk, self._pending))
+            self._pending = []
+
+    def results(self) -> List[Dict[str, Any]]:
+        """Wait for every queued transcript and return the records in submission order."""
+        self._flush()
+        return [record for future in self._futures for record in future.result()]
+
+    def close(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
+
+    def __enter__(self) -> "AnalysisPool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+# ------------------------------------------------------------------------------
+# Async Crawler Engine
+# ------------------------------------------------------------------------------
+class AsyncFetcher:
+    """
+    Async counterpart of fetch_page with a bound on in-flight requests.
+    Requests run on a private thread pool over the shared keep-alive session,
+    so pooling and stats behave exactly as on the serial path.
+    """
+
+    def __init__(self, max_in_flight: int = 8) -> None:
+        self.max_in_flight: int = max(1, max_in_flight)
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=self.max_in_flight, thread_name_prefix="fetch"
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def fetch_page(self, url: str) -> str:
+        return await self.call(fetch_page, url)
+
+    async def fetch_document(self, url: str) -> Page:
+        return await self.call(fetch_document, url)
+
+    async def call(self, fetch: Callable[[str], Any], url: str) -> Any:
+        """Run a blocking fetch of `url` (fetch_page, load_topic_page, ...) within the in-flight bound."""
+        # Created lazily so the semaphore binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fetch, url)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+async def _crawl_listing_async(first_url: str, parse: Callable[[Markup, str], ListingPage],
+                               fetcher: AsyncFetcher,
+                               load_page: Optional[Callable[[str], ListingPage]] = None) -> List[Dict[str, Any]]:
+    """
+    Async version of _crawl_listing; the extra pages share the fetcher's in-flight
+    bound and parsing runs off the event loop.
+    """
+    loop = asyncio.get_running_loop()
+
+    async def fetch_and_parse(url: str) -> ListingPage:
+        if load_page is not None:
+            return await fetcher.call(load_page, url)
+        body: Page = await fetcher.fetch_document(url)
+        return await loop.run_in_executor(None, parse, body, url)
+
+    page: ListingPage = await fetch_and_parse(first_url)
+    items: List[Dict[str, Any]] = list(page.items)
+    if page.page_urls is not None:
+        for other in await asyncio.gather(*(fetch_and_parse(url) for url in page.page_urls)):
+            items.extend(other.items)
+        return items
+
+    next_page_url: Optional[str] = page.next_url
+    while next_page_url:
+        page = await fetch_and_parse(next_page_url)
+        items.extend(page.items)
+        next_page_url = page.next_url
+    return items
+
+
+async def scrape_all_tv_show_forums_async(fetcher: AsyncFetcher) -> List[Dict[str, str]]:
+    """Async version of scrape_all_tv_show_forums."""
+    logger.info("Scraping from the 'TV Shows' forum (f=1662).")
+    all_shows: List[Dict[str, str]] = await _crawl_listing_async(TV_SHOWS_URL, _parse_show_listing, fetcher)
+    logger.info(f"Total sub-forums (TV shows) found: {len(all_shows)}")
+    return all_shows
+
+
+async def scrape_episode_links_async(show_url: str, fetcher: AsyncFetcher) -> List[Dict[str, Any]]:
+    """Async version of scrape_episode_links."""
+    logger.info(f"Scraping episode links from: {show_url}")
+    return await _crawl_listing_async(show_url, _parse_episode_listing, fetcher)
+
+
+async def fetch_transcript_async(episode: Dict[str, Any], fetcher: AsyncFetcher) -> str:
+    """Async version of fetch_transcript."""
+    posts: List[Dict[str, Any]] = await _crawl_listing_async(episode["url"], _parse_topic_page, fetcher, load_topic_page)
+    return stitch_transcript(episode, posts)
+
+
+async def process_episode_async(episode: Dict[str, Any], fetcher: AsyncFetcher) -> Dict[str, Any]:
+    """Async version of process_episode; the CPU-bound analysis runs off the event loop."""
+    logger.info(f"Processing episode: {episode['title']}")
+    transcript: str = await fetch_transcript_async(episode, fetcher)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, analyze_transcript, episode, transcript)
+
+
+def _failure_record(episode: Dict[str, Any], exc: Exception) -> Dict[str, Any]:
+    logger.error(f"Skipping episode '{episode['title']}': {exc}")
+    return {"title": episode["title"], "url": episode["url"], "error": str(exc)}
+
+
+async def process_episodes_async(
+    episodes: List[Dict[str, Any]], max_in_flight: int = 8, pool: Optional[AnalysisPool] = None
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Process all episodes concurrently; results keep the order of `episodes`.
+    Episodes whose fetch fails are skipped and returned as failure records.
+    With a `pool`, transcripts are handed to its worker processes as they arrive.
+    """
+    fetcher = AsyncFetcher(max_in_flight)
+
+    async def guarded(ep: Dict[str, Any]) -> Any:
+        try:
+            if pool is None:
+                return await process_episode_async(ep, fetcher)
+            logger.info(f"Fetching episode: {ep['title']}")
+            return pool.submit(ep, await fetch_transcript_async(ep, fetcher))
+        except requests.RequestException as exc:
+            return exc
+
+    try:
+        results = await asyncio.gather(*(guarded(ep) for ep in episodes))
+    finally:
+        fetcher.close()
+
+    analyzed: List[Dict[str, Any]] = pool.results() if pool else []
+    processed: List[Dict[str, Any]] = []
+    failures: List[Dict[str, Any]] = []
+    for ep, result in zip(episodes, results):
+        if isinstance(result, Exception):
+            failures.append(_failure_record(ep, result))
+        else:
+            processed.append(analyzed[result] if pool else result)
+    return processed, failures
+
+
+def process_episodes(
+    episodes: List[Dict[str, Any]], concurrency: int = 1, workers: int = 1,
+    batch_size: int = ANALYSIS_CHUNK_SIZE
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Process episodes serially, or through the async engine when concurrency > 1.
+    With workers != 1 the analysis runs in an AnalysisPool (0 = one worker per core)
+    in batches of `batch_size` episodes that share one lemmatization pass.
+    Returns (processed episodes, failure records for episodes that could not be fetched).
+    """
+    failures: List[Dict[str, Any]] = []
+    if workers != 1:
+        with AnalysisPool(workers, batch_size) as pool:
+            if concurrency > 1:
+                return asyncio.run(process_episodes_async(episodes, concurrency, pool))
+            for ep in episodes:
+                logger.info(f"Fetching episode: {ep['title']}")
+                try:
+                    pool.submit(ep, fetch_transcript(ep))
+                except requests.RequestException as exc:
+                    failures.append(_failure_record(ep, exc))
+            return pool.results(), failures
+    if concurrency > 1:
+        return asyncio.run(process_episodes_async(episodes, concurrency))
+    processed: List[Dict[str, Any]] = []
+    for ep in episodes:
+        try:
+            processed.append(process_episode(ep))
+        except requests.RequestException as exc:
+            failures.append(_failure_record(ep, exc))
+    return processed, failures
+
+
+def write_csv(processed_episodes: List[Dict[str, Any]], csv_file: str) -> None:
+    """Write processed episodes to the analysis CSV."""
+    csv_columns: List[str] = [
+        "Season", "Episode", "Title", "Cleaned Transcript",
+        "Negative Story Elements", "Positive Story Elements", "Narrative Tone Annotations"
+    ]
+
+    with open(csv_file, mode='w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=csv_columns)
+        writer.writeheader()
+        for ep_data in processed_episodes:
+            writer.writerow({
+                "Season": ep_data["season"],
+                "Episode": ep_data["episode"],
+                "Title": ep_data["title"],
+                "Cleaned Transcript": ep_data["cleaned_transcript"],
+                "Negative Story Elements": json.dumps(ep_data["negative_story_elements"]),
+                "Positive Story Elements": json.dumps(ep_data["positive_story_elements"]),
+                "Narrative Tone Annotations": json.dumps(ep_data["narrative_tone"])
+            })
+
+# ------------------------------------------------------------------------------
+# Token Corpus
+# ------------------------------------------------------------------------------
+class TokenCorpus:
+    """
+    Cleaned transcripts as integer token IDs: one vocabulary shared by every episode, the
+    IDs of all episodes in one int32 array, and offsets[i]:offsets[i + 1] marking episode i.
+    Analyses run as array operations over the IDs instead of re-splitting strings, and the
+    corpus saves to a single .npz without pickled objects. numpy is imported on first use.
+    """
+
+    def __init__(self, vocabulary: List[str], ids: Any, offsets: Any, episodes: List[Dict[str, Any]]) -> None:
+        self.vocabulary: List[str] = vocabulary
+        self.word_ids: Dict[str, int] = {word: i for i, word in enumerate(vocabulary)}
+        self.ids = ids             # int32[total tokens]
+        self.offsets = offsets     # int64[episodes + 1]
+        self.episodes: List[Dict[str, Any]] = episodes   # season, episode, title per episode
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> TokenCorpus:
+        """Build a corpus from analyze_transcript output records, splitting each cleaned transcript once."""
+        import numpy as np
+        vocabulary: Dict[str, int] = {}
+        arrays: List[Any] = [
+            np.fromiter((vocabulary.setdefault(token, len(vocabulary)) for token in record["cleaned_transcript"].split()),
+                        dtype=np.int32)
+            for record in records
+        ]
+        offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+        np.cumsum([len(ids) for ids in arrays], out=offsets[1:])
+        ids = np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int32)
+        episodes: List[Dict[str, Any]] = [{key: record[key] for key in ("season", "episode", "title")} for record in records]
+        return cls(list(vocabulary), ids, offsets, episodes)
+
+    def __len__(self) -> int:
+        return len(self.episodes)
+
+    def episode_ids(self, index: int) -> Any:
+        """Token IDs of episode `index` (a view, not a copy)."""
+        return self.ids[self.offsets[index]:self.offsets[index + 1]]
+
+    def tokens(self, index: int) -> List[str]:
+        vocabulary: List[str] = self.vocabulary
+        return [vocabulary[i] for i in self.episode_ids(index).tolist()]
+
+    def lengths(self) -> Any:
+        """Tokens per episode."""
+        import numpy as np
+        return np.diff(self.offsets)
+
+    def _episode_of_token(self) -> Any:
+        import numpy as np
+        return np.repeat(np.arange(len(self), dtype=np.int64), self.lengths())
+
+    def term_counts(self) -> Any:
+        """Episodes x vocabulary matrix of token counts, from one bincount over the whole corpus."""
+        import numpy as np
+        width: int = len(self.vocabulary)
+        cells = self._episode_of_token() * width + self.ids
+        return np.bincount(cells, minlength=len(self) * width).reshape(len(self), width)
+
+    def count_terms(self, terms: List[str]) -> Any:
+        """Episodes x `terms` counts of a few distinct terms (0 for terms that never occur), without the full matrix."""
+        import numpy as np
+        column_of_id = np.full(len(self.vocabulary), -1, dtype=np.int64)
+        for column, term in enumerate(terms):
+            if term in self.word_ids:
+                column_of_id[self.word_ids[term]] = column
+        columns = column_of_id[self.ids]
+        hits = columns >= 0
+        cells = self._episode_of_token()[hits] * len(terms) + columns[hits]
+        return np.bincount(cells, minlength=len(self) * len(terms)).reshape(len(self), len(terms))
+
+    def save(self, path: str) -> None:
+        """Write the corpus as an uncompressed .npz (vocabulary and episode metadata as UTF-8 bytes)."""
+        import numpy as np
+        with open(path, "wb") as f:   # a file object, so numpy doesn't append .npz to the name
+            np.savez(
+                f,
+                ids=self.ids,
+                offsets=self.offsets,
+                vocabulary=np.frombuffer("\n".join(self.vocabulary).encode("utf-8"), dtype=np.uint8),
+                episodes=np.frombuffer(json.dumps(self.episodes).encode("utf-8"), dtype=np.uint8),
+            )
+
+    @classmethod
+    def load(cls, path: str) -> TokenCorpus:
+        import numpy as np
+        with np.load(path) as data:
+            vocabulary_text: str = data["vocabulary"].tobytes().decode("utf-8")
+            return cls(
+                vocabulary_text.split("\n") if vocabulary_text else [],
+                data["ids"],
+                data["offsets"],
+                json.loads(data["episodes"].tobytes().decode("utf-8")),
+            )
+
+# ------------------------------------------------------------------------------
+# Show Index
+# ------------------------------------------------------------------------------
+def _normalize_title(title: str) -> str:
+    return " ".join(title.lower().split())
+
+
+def _trigrams(text: str) -> List[str]:
+    padded: str = f"  {text} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance using Myers' bit-parallel algorithm (one pass over `b`)."""
+    if not a:
+        return len(b)
+    full: int = (1 << len(a)) - 1
+    high: int = 1 << (len(a) - 1)
+    peq: Dict[str, int] = {}
+    for i, char in enumerate(a):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    pv, mv, score = full, 0, len(a)
+    for char in b:
+        eq: int = peq.get(char, 0)
+        xv: int = eq | mv
+        xh: int = (((eq & pv) + pv) ^ pv) | eq
+        ph: int = mv | (~(xh | pv) & full)
+        mh: int = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return score
+
+
+class ShowIndex:
+    """
+    Local index of the 'TV Shows' sub-forums, persisted as JSON with its build time
+    and the BASE_URL it was scraped from (an index of another forum is never fresh).
+    Exact lookups are a dict hit, prefix lookups bisect a sorted title list, and
+    fuzzy lookups shortlist titles sharing character trigrams with the query
+    before ranking them by edit distance.
+    """
+
+    def __init__(self, shows: List[Dict[str, str]], built_at: Optional[float] = None,
+                 base_url: Optional[str] = None) -> None:
+        self.shows: List[Dict[str, str]] = shows
+        self.built_at: float = built_at if built_at is not None else time.time()
+        self.base_url: str = base_url if base_url is not None else BASE_URL
+        self._exact: Dict[str, Dict[str, str]] = {}
+        for show in shows:
+            # First listing wins, as in the original linear search
+            self._exact.setdefault(show["title"].lower(), show)
+        self._normalized: List[str] = [_normalize_title(show["title"]) for show in shows]
+        self._sorted: List[Tuple[str, int]] = sorted((title, i) for i, title in enumerate(self._normalized))
+        self._sorted_keys: List[str] = [title for title, _ in self._sorted]
+        self._trigram_postings: Dict[str, List[int]] = {}
+        for i, title in enumerate(self._normalized):
+            for gram in set(_trigrams(title)):
+                self._trigram_postings.setdefault(gram, []).append(i)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["ShowIndex"]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data: Dict[str, Any] = json.load(f)
+            # Indexes saved before base URLs were recorded get "" and are rebuilt
+            return cls(data["shows"], data["built_at"], data.get("base_url", ""))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, path: str) -> None:
+        tmp_path: str = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"built_at": self.built_at, "base_url": self.base_url, "shows": self.shows}, f)
+        os.replace(tmp_path, path)
+
+    def is_fresh(self, ttl: float) -> bool:
+        """Younger than `ttl` seconds and built from the forum at the current BASE_URL."""
+        return self.base_url == BASE_URL and time.time() - self.built_at < ttl
+
+    def exact(self, title: str) -> Optional[Dict[str, str]]:
+        """Case-insensitive exact title match."""
+        return self._exact.get(title.lower())
+
+    def prefix(self, prefix: str, limit: int = 10) -> List[Dict[str, str]]:
+        """Shows whose normalized title starts with `prefix`, alphabetically."""
+        key: str = _normalize_title(prefix)
+        matches: List[Dict[str, str]] = []
+        for title, i in self._sorted[bisect.bisect_left(self._sorted_keys, key):]:
+            if not title.startswith(key) or len(matches) >= limit:
+                break
+            matches.append(self.shows[i])
+        return matches
+
+    def fuzzy(self, query: str, limit: int = 5, candidates: int = 15) -> List[Tuple[Dict[str, str], int]]:
+        """Closest titles to `query` as (show, edit distance), best first."""
+        key: str = _normalize_title(query)
+        overlap: Counter = Counter(chain.from_iterable(
+            self._trigram_postings.get(gram, ()) for gram in set(_trigrams(key))
+        ))
+        shortlist: List[int] = [i for i, _ in overlap.most_common(candidates)]
+        ranked: List[Tuple[int, int]] = sorted((_edit_distance(key, self._normalized[i]), i) for i in shortlist)
+        return [(self.shows[i], distance) for distance, i in ranked[:limit]]
+
+
+def _save_rest_of_show_index(shows: Iterator[Dict[str, str]], seen: List[Dict[str, str]], index_path: str) -> None:
+    """Read the rest of a listing stream that stopped at a match and save every show as the index."""
+    try:
+        seen.extend(shows)
+    except requests.RequestException as exc:
+        logger.warning(f"Show index not saved, the rest of the listing failed: {exc}")
+        return
+    index: ShowIndex = ShowIndex(seen)
+    index.save(index_path)
+    logger.info(f"Saved show index {index_path} ({len(index.shows)} shows)")
+
+
+def lookup_show(tv_show: str, index_path: str,
+                ttl: float) -> Tuple[Optional[Dict[str, str]], Optional[ShowIndex], Optional[threading.Thread]]:
+    """
+    Find `tv_show` in the fresh local index, or else by streaming the forum listing
+    until it matches. A stream that runs to the end has seen every show, so it is
+    saved as the new index; after a match, a background thread reads the rest of the
+    listing and saves the index while the run goes on. Returns (matched show, index
+    if one was loaded or built, that thread if started -- join it before exiting).
+    """
+    index: Optional[ShowIndex] = ShowIndex.load(index_path)
+    if index is not None and index.is_fresh(ttl):
+        logger.info(f"Using show index {index_path} ({len(index.shows)} shows)")
+        return index.exact(tv_show), index, None
+
+    seen: List[Dict[str, str]] = []
+    shows: Iterator[Dict[str, str]] = iter_tv_show_forums()
+    matched: Optional[Dict[str, str]] = find_tv_show(tv_show, seen, shows)
+    if matched:
+        saver: threading.Thread = threading.Thread(target=_save_rest_of_show_index, args=(shows, seen, index_path),
+                                                   name="show-index")
+        saver.start()
+        return matched, None, saver
+    index = ShowIndex(seen)
+    index.save(index_path)
+    logger.info(f"Saved show index {index_path} ({len(index.shows)} shows)")
+    return None, index, None
+
+
+def load_show_index(path: str, ttl: float, refresh: bool = False) -> ShowIndex:
+    """Return the persisted show index, re-scraping the forum list if it is missing or stale."""
+    index: Optional[ShowIndex] = None if refresh else ShowIndex.load(path)
+    if index is not None and index.is_fresh(ttl):
+        logger.info(f"Using show index {path} ({len(index.shows)} shows)")
+        return index
+    index = ShowIndex(scrape_all_tv_show_forums())
+    index.save(path)
+    logger.info(f"Saved show index {path} ({len(index.shows)} shows)")
+    return index
+
+# ------------------------------------------------------------------------------
+# Main Entry Point
+# ------------------------------------------------------------------------------
+def log_connection_stats() -> None:
+    """Log how many requests per host were served over reused keep-alive connections."""
+    for host, counters in connection_stats.summary().items():
+        logger.info(
+            f"Connections to {host}: {counters['requests']} requests, "
+            f"{counters['new_connections']} new, {counters['reused']} reused "
+            f"(reuse ratio {counters['reuse_ratio']})"
+        )
+
+
+def log_cache_stats() -> None:
+    """Log how much of the run was served from the on-disk HTTP cache."""
+    if _http_cache is not None:
+        stats = _http_cache.stats
+        logger.info(
+            f"HTTP cache: {stats['hits']} fresh hits, {stats['revalidated']} revalidated, "
+            f"{stats['misses']} misses, {stats['bytes_saved']} bytes not re-downloaded"
+        )
+
+
+def log_rate_limiter_state() -> None:
+    """Log the adaptive rate each host settled at."""
+    if _rate_limiter is not None:
+        for host, state in _rate_limiter.snapshot().items():
+            logger.info(
+                f"Rate limit for {host}: {state['rate']}/s, concurrency {state['concurrency']}, "
+                f"{state['throttled_responses']} throttled responses, "
+                f"backoff remaining {state['backoff_remaining']}s"
+            )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line options; the show name is prompted for when omitted."""
+    defaults = SessionConfig()
+    parser = argparse.ArgumentParser(description="Scrape and annotate TV transcripts from ForeverDreaming.")
+    parser.add_argument("show", nargs="?", help="TV show name (prompted for if omitted)")
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help="forum to crawl, e.g. a local mock_forum_server.py")
+    parser.add_argument("--pool-connections", type=int, default=defaults.pool_connections,
+                        help="number of per-host connection pools to keep alive")
+    parser.add_argument("--pool-maxsize", type=int, default=defaults.pool_maxsize,
+                        help="maximum open connections per host")
+    parser.add_argument("--pool-block", action="store_true",
+                        help="wait for a free pooled connection instead of opening extra ones")
+    parser.add_argument("--connect-timeout", type=float, default=defaults.connect_timeout,
+                        help="seconds to wait when opening a connection")
+    parser.add_argument("--read-timeout", type=float, default=defaults.read_timeout,
+                        help="seconds to wait for response data")
+    parser.add_argument("--cache-dir",
+                        help="directory for the on-disk HTTP cache (disabled if omitted)")
+    parser.add_argument("--cache-ttl", type=float, default=24 * 3600,
+                        help="seconds a cached page is served without revalidation")
+    parser.add_argument("--cache-max-mb", type=float, default=512,
+                        help="size limit of cached bodies before LRU eviction")
+    archive_mode = parser.add_mutually_exclusive_group()
+    archive_mode.add_argument("--record", metavar="ARCHIVE",
+                              help="append every fetched response to a .warc.gz-style archive")
+    archive_mode.add_argument("--replay", metavar="ARCHIVE",
+                              help="serve every request from an archive instead of the network")
+    parser.add_argument("--rate-limit", type=float, metavar="REQ_PER_SEC",
+                        help="enable the adaptive per-host limiter, starting at this request rate")
+    parser.add_argument("--max-rate", type=float, default=RateLimitConfig.max_rate,
+                        help="upper bound for the adaptive per-host request rate")
+    parser.add_argument("--latency-target", type=float, default=RateLimitConfig.latency_target,
+                        help="response time (s) above which the limiter backs off")
+    parser.add_argument("--max-attempts", type=int, default=RetryPolicy.max_attempts,
+                        help="attempts per request before an episode is skipped")
+    parser.add_argument("--request-deadline", type=float, default=RetryPolicy.deadline,
+                        help="seconds one request may take including retries")
+    parser.add_argument("--breaker-threshold", type=int, default=RetryPolicy.breaker_threshold,
+                        help="consecutive failures that pause a host")
+    parser.add_argument("--breaker-cooldown", type=float, default=RetryPolicy.breaker_cooldown,
+                        help="seconds a failing host stays paused")
+    parser.add_argument("--index-file", default=".tv_show_index.json",
+                        help="where the list of TV show forums is cached")
+    parser.add_argument("--index-ttl", type=float, default=7 * 24 * 3600,
+                        help="seconds before the show index is rebuilt from the forum")
+    parser.add_argument("--refresh-index", action="store_true",
+                        help="rebuild the show index even if it is still fresh")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="episodes fetched in flight at once (1 = serial)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes for cleaning/lemmatizing/annotating (0 = one per core, 1 = in-process)")
+    parser.add_argument("--batch-size", type=int, default=ANALYSIS_CHUNK_SIZE,
+                        help="episodes per worker task with --workers; each batch lemmatizes its distinct words once")
+    parser.add_argument("--parser", choices=sorted(PARSER_BACKENDS), default=SoupBackend.name,
+                        help="HTML parser for listing and topic pages (lxml/selectolax are much faster)")
+    parser.add_argument("--stream-topics", action="store_true",
+                        help="extract transcripts while topic pages download (ignored with --cache-dir/--record/--replay)")
+    parser.add_argument("--no-nltk-download", action="store_true",
+                        help="never download NLTK data; fail if stopwords/punkt_tab/wordnet aren't installed")
+    parser.add_argument("--tokenizer", choices=sorted(TOKENIZERS), default=_tokenizer,
+                        help="word tokenizer: nltk (reference) or fast (Punkt-free regex, 3-10x faster)")
+    parser.add_argument("--lemma-table", metavar="PATH",
+                        help="precompiled lemma table to look words up in before WordNet (see --build-lemma-table)")
+    parser.add_argument("--build-lemma-table", nargs="+", metavar="SOURCE",
+                        help="build --lemma-table from the words of raw transcripts (--record archives, CSV or text files) "
+                             "plus WordNet's exception lists, then exit")
+    parser.add_argument("--corpus", metavar="PATH.npz",
+                        help="also save the cleaned transcripts as a token-ID corpus (see TokenCorpus)")
+    args = parser.parse_args(argv)
+    if args.build_lemma_table and not args.lemma_table:
+        parser.error("--build-lemma-table needs --lemma-table PATH to write to")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main script function: gather TV show from user, find it, scrape episodes, annotate, save CSV."""
+    args = parse_args(argv)
+    set_base_url(args.base_url)
+    configure_parser(args.parser)
+    configure_topic_streaming(args.stream_topics)
+    configure_nltk_download(not args.no_nltk_download)
+    configure_tokenizer(args.tokenizer)
+    # Verify NLTK data before crawling, so a missing package fails in seconds rather than after the crawl
+    ensure_nltk_resources()
+    if args.build_lemma_table:
+        build_lemma_table_from_files(args.lemma_table, args.build_lemma_table)
+        return
+    configure_lemma_table(args.lemma_table)
+    configure_session(SessionConfig(
+        pool_connections=args.pool_connections,
+        # Every in-flight request needs its own pooled connection to be reused
+        pool_maxsize=max(args.pool_maxsize, args.concurrency),
+        pool_block=args.pool_block,
+        connect_timeout=args.connect_timeout,
+        read_timeout=args.read_timeout,
+    ))
+    configure_retries(RetryPolicy(
+        max_attempts=args.max_attempts,
+        deadline=args.request_deadline,
+        breaker_threshold=args.breaker_threshold,
+        breaker_cooldown=args.breaker_cooldown,
+    ))
+    if args.rate_limit:
+        configure_rate_limiter(HostRateLimiter(RateLimitConfig(
+            initial_rate=args.rate_limit,
+            max_rate=args.max_rate,
+            latency_target=args.latency_target,
+            max_concurrency=max(1, args.concurrency),
+        )))
+    if args.record:
+        configure_archive(CrawlArchive(args.record, "record"))
+    elif args.replay:
+        configure_archive(CrawlArchive(args.replay, "replay"))
+    if args.cache_dir:
+        configure_cache(HttpCache(args.cache_dir, ttl=args.cache_ttl, max_bytes=int(args.cache_max_mb * 1024 * 1024)))
+    tv_show: str = (args.show or input("Enter TV show name: ")).strip().lower()
+
+    # 1-2. Match user input against the shows under 'TV Shows' forum (f=1662): from the
+    # local index when fresh, otherwise by streaming the listing until the first match
+    index_saver: Optional[threading.Thread] = None
+    if args.refresh_index:
+        show_index: Optional[ShowIndex] = load_show_index(args.index_file, args.index_ttl, refresh=True)
+        matched_forum = show_index.exact(tv_show)
+    else:
+        matched_forum, show_index, index_saver = lookup_show(tv_show, args.index_file, args.index_ttl)
+
+    # 3. Error if not found
+    if not matched_forum:
+        logger.error(f"TV show '{tv_show}' not found under 'TV Shows' (f=1662).")
+        suggestions = show_index.prefix(tv_show) or [show for show, _ in show_index.fuzzy(tv_show)]
+        if suggestions:
+            logger.error("Did you mean: " + ", ".join(show["title"] for show in suggestions))
+        return
+
+    # 4. Scrape episodes for that matched show
+    show_url = matched_forum["url"]
+    logger.info(f"Found TV show '{matched_forum['title']}' at URL: {show_url}")
+    episodes: List[Dict[str, Any]] = scrape_episode_links(show_url)
+    logger.info(f"Total episodes found for '{matched_forum['title']}': {len(episodes)}")
+
+    # 5. Process each episode (results keep listing order on both paths)
+    started: float = time.perf_counter()
+    processed_episodes, failed_episodes = process_episodes(episodes, args.concurrency, args.workers, args.batch_size)
+    elapsed: float = time.perf_counter() - started
+    logger.info(f"Processed {len(processed_episodes)} episodes in {elapsed:.2f}s "
+                f"({len(processed_episodes) / elapsed if elapsed else 0:.1f} episodes/s)")
+
+    # 6. Write data to CSV
+    csv_file: str = "transcript_analysis.csv"
+    write_csv(processed_episodes, csv_file)
+
+    logger.info(f"CSV report generated: {csv_file}")
+    if args.corpus:
+        corpus: TokenCorpus = TokenCorpus.from_records(processed_episodes)
+        corpus.save(args.corpus)
+        logger.info(f"Token corpus saved: {args.corpus} ({len(corpus.vocabulary)} words, {len(corpus.ids)} tokens)")
+    failures_file: str = "failed_episodes.json"
+    if failed_episodes:
+        with open(failures_file, mode='w', encoding='utf-8') as file:
+            json.dump(failed_episodes, file, indent=2)
+        logger.warning(f"{len(failed_episodes)} episodes failed and were skipped; see {failures_file}")
+    else:
+        # A list left by an earlier run would otherwise sit next to this complete CSV
+        try:
+            os.remove(failures_file)
+            logger.info(f"Removed {failures_file} from an earlier run")
+        except FileNotFoundError:
+            pass
+    if index_saver is not None:
+        index_saver.join()   # its listing requests go into the stats and the archive below
+    log_connection_stats()
+    log_cache_stats()
+    log_rate_limiter_state()
+    if _crawl_archive is not None:
+        _crawl_archive.close()
 
 if __name__ == '__main__':
     main()